@@ -0,0 +1,41 @@
+"""Peak memory and total time for a bursty fan-out of many coroutines, each of which holds onto a buffer whilst it
+runs, with and without `tinyio.Loop(max_active=...)`.
+
+Run with `python benchmarks/bench_admission.py`.
+"""
+
+import time
+import tracemalloc
+
+import tinyio
+
+
+def _handler():
+    buffer = bytearray(1024)
+    for _ in range(5):
+        yield
+    return len(buffer)
+
+
+def _main(num_coros):
+    coros = [_handler() for _ in range(num_coros)]
+    yield set(coros)
+    return sum((yield coros))
+
+
+def main():
+    num_coros = 100_000
+    print(f"{'max_active':>12} {'peak memory (MB)':>18} {'time (s)':>10}")
+    for max_active in (None, 10_000, 1_000, 100):
+        tracemalloc.start()
+        start = time.perf_counter()
+        out = tinyio.Loop(max_active=max_active).run(_main(num_coros))
+        duration = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        assert out == 1024 * num_coros
+        print(f"{str(max_active):>12} {peak / 1e6:>18.1f} {duration:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
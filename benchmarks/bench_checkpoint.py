@@ -0,0 +1,65 @@
+"""Cost of a CPU-heavy coroutine offering to give up control on every iteration of a tight loop, using either a bare
+`yield` or `tinyio.checkpoint()`, and how quickly another coroutine then gets to run.
+
+Run with `python benchmarks/bench_checkpoint.py`.
+"""
+
+import time
+
+import tinyio
+
+
+def _crunch_yield(n):
+    total = 0
+    for i in range(n):
+        total += i
+        yield
+
+
+def _crunch_checkpoint(n):
+    total = 0
+    for i in range(n):
+        total += i
+        yield from tinyio.checkpoint()
+
+
+def _ticker(done, latencies):
+    # Measures the gaps between getting to run.
+    last = time.perf_counter()
+    while not done:
+        yield
+        now = time.perf_counter()
+        latencies.append(now - last)
+        last = now
+
+
+def _main(crunch, n, out):
+    done = []
+    latencies = []
+    start = time.perf_counter()
+    yield [_ticker(done, latencies), _finish(crunch(n), done)]
+    out.append((time.perf_counter() - start) / n)
+    out.append(max(latencies))
+
+
+def _finish(coro, done):
+    yield coro
+    done.append(True)
+
+
+def main():
+    n = 500_000
+    print(f"{'':>32} {'ns per iteration':>18} {'worst latency for others (ms)':>32}")
+    for name, crunch, time_slice in (
+        ("bare `yield`", _crunch_yield, None),
+        ("`checkpoint()`, 1ms slice", _crunch_checkpoint, 1e-3),
+        ("`checkpoint()`, 10ms slice", _crunch_checkpoint, 1e-2),
+    ):
+        out = []
+        tinyio.Loop(time_slice=time_slice).run(_main(crunch, n, out))
+        per_iteration, latency = out
+        print(f"{name:>32} {per_iteration * 1e9:>18.0f} {latency * 1e3:>32.2f}")
+
+
+if __name__ == "__main__":
+    main()
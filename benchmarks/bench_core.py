@@ -0,0 +1,125 @@
+"""Core scheduler benchmarks: the per-step cost of the most common shapes of `yield`, and the memory used by
+coroutines that are parked inside the loop.
+
+Run with `python benchmarks/bench_core.py`.
+"""
+
+import time
+import tracemalloc
+
+import tinyio
+
+
+def _bare_yields(n):
+    for _ in range(n):
+        yield
+
+
+def _leaf():
+    yield
+    return 1
+
+
+def _chain(depth):
+    if depth == 0:
+        return (yield _leaf())
+    else:
+        return (yield _chain(depth - 1))
+
+
+def _sequential_calls(n):
+    for _ in range(n):
+        yield _chain(5)
+
+
+def _gathers(n):
+    for _ in range(n):
+        yield [_leaf(), _leaf()]
+
+
+def _wide_gathers(n, width):
+    # A fan-out of `width` children, each of which is then also waited on again once it has finished.
+    for _ in range(n):
+        leaves = [_leaf() for _ in range(width)]
+        yield leaves
+        yield leaves
+
+
+def _producer_consumer(n):
+    # A bounded pipeline: the producer and consumer hand items over via a pair of events.
+    items = []
+    ready = tinyio.Event()
+    consumed = tinyio.Event()
+    consumed.set()
+
+    def producer():
+        for i in range(n):
+            yield consumed.wait()
+            consumed.clear()
+            items.append(i)
+            ready.set()
+
+    def consumer():
+        for _ in range(n):
+            yield ready.wait()
+            ready.clear()
+            items.pop()
+            consumed.set()
+
+    yield [producer(), consumer()]
+
+
+def _time_per_step(name, make_coro, num_steps, repeat=5):
+    # Best-of-`repeat`, to cut down on noise.
+    best = float("inf")
+    for _ in range(repeat):
+        coro = make_coro()
+        start = time.perf_counter()
+        tinyio.Loop().run(coro)
+        best = min(best, time.perf_counter() - start)
+    print(f"{name:>30} {best / num_steps * 1e9:>15.0f}")
+
+
+def _parked(event):
+    yield [event.wait(), _leaf()]
+
+
+def _parked_main(num_parked, out):
+    event = tinyio.Event()
+    coros = [_parked(event) for _ in range(num_parked)]
+
+    def measure():
+        yield
+        yield
+        out.append(tracemalloc.get_traced_memory()[0])
+        event.set()
+
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    yield [measure(), *coros]
+    tracemalloc.stop()
+    out.append(baseline)
+
+
+def main():
+    n = 100_000
+    print(f"{'benchmark':>30} {'ns per step':>15}")
+    _time_per_step("bare yield", lambda: _bare_yields(n), n)
+    # Each `_chain(5)` is six coroutines, each of which is stepped twice.
+    _time_per_step("yield coro (depth-6 chain)", lambda: _sequential_calls(n // 12), n)
+    # Each gather steps the parent once and each `_leaf` twice.
+    _time_per_step("yield [coro, coro]", lambda: _gathers(n // 5), n)
+    # Each wide gather steps the parent twice and each `_leaf` twice.
+    _time_per_step("yield [coro] * 1000, twice", lambda: _wide_gathers(n // 2002, 1000), n)
+    # Each item is two steps of the producer and two of the consumer.
+    _time_per_step("producer/consumer", lambda: _producer_consumer(n // 4), n)
+    print()
+    num_parked = 10_000
+    out = []
+    tinyio.Loop().run(_parked_main(num_parked, out))
+    parked_memory, baseline = out
+    print(f"{'parked `yield [wait, coro]`':>30} {(parked_memory - baseline) / num_parked:>15.0f} bytes each")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Synthetic overload: a stream of requests, each with a deadline, arriving faster than the loop can serve them all.
+Compares how many meet their deadline under `scheduling="fifo"` against `scheduling="deadline"`.
+
+Most requests are interactive (a little work, a tight deadline), and the rest are bulk (more work, a loose deadline).
+
+Run with `python benchmarks/bench_deadline.py`.
+"""
+
+import random
+import time
+
+import tinyio
+
+
+_step_time = 50e-6
+# (probability, number of steps of work, deadline)
+_kinds = {"interactive": (0.8, 4, 0.02), "bulk": (0.2, 20, 0.5)}
+
+
+def _work():
+    end = time.perf_counter() + _step_time
+    while time.perf_counter() < end:
+        pass
+
+
+def _request(kind, deadline, results):
+    _, num_steps, _ = _kinds[kind]
+    for _ in range(num_steps):
+        _work()
+        yield
+    results.append((kind, time.monotonic() <= deadline))
+
+
+def _arrivals(load, duration, results):
+    rng = random.Random(0)
+    mean_work = sum(p * num_steps * _step_time for p, num_steps, _ in _kinds.values())
+    mean_gap = mean_work / load
+    start = time.monotonic()
+    arrival = start
+    requests = []
+    while arrival < start + duration:
+        arrival += rng.expovariate(1 / mean_gap)
+        [kind] = rng.choices(list(_kinds), weights=[p for p, _, _ in _kinds.values()])
+        now = time.monotonic()
+        if arrival > now:
+            yield tinyio.sleep(arrival - now)
+        deadline = arrival + _kinds[kind][2]
+        request = tinyio.deadline(tinyio.priority(_request(kind, deadline, results), "normal"), deadline)
+        requests.append(request)
+        yield {request}
+    yield requests
+
+
+def main():
+    duration = 2
+    print(f"{'load':>6} {'scheduling':>12} {'met deadline: all':>20} {'interactive':>12} {'bulk':>8}")
+    for load in (0.7, 1.0, 1.3):
+        for scheduling in ("fifo", "deadline"):
+            results = []
+            # Arrivals need to happen on time, regardless of how busy we are.
+            tinyio.Loop(scheduling=scheduling).run(tinyio.priority(_arrivals(load, duration, results), "high"))
+            rates = []
+            for kind in (None, "interactive", "bulk"):
+                met = [ok for k, ok in results if kind is None or k == kind]
+                rates.append(100 * sum(met) / len(met))
+            print(f"{load:>6} {scheduling:>12} {rates[0]:>19.1f}% {rates[1]:>11.1f}% {rates[2]:>7.1f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""Peak memory of running a large job over a lazily-generated source: building every coroutine up front with
+`yield [...]`, against pulling from the source as slots free up with `tinyio.gather(..., limit=...)`.
+
+The outputs themselves must still be stored, so peak memory is reported alongside the size of the output list.
+
+Run with `python benchmarks/bench_gather.py`.
+"""
+
+import sys
+import time
+import tracemalloc
+
+import tinyio
+
+
+def _child(row):
+    yield
+    return row
+
+
+def _source(n):
+    for row in range(n):
+        yield _child(row)
+
+
+def _gather(n):
+    return (yield [coro for coro in _source(n)])
+
+
+def _gather_limit(n):
+    return (yield tinyio.gather(_source(n), limit=100))
+
+
+def main():
+    n = 200_000
+    print(f"{'':>24} {'peak memory (MB)':>18} {'of which outputs (MB)':>22} {'time (s)':>10}")
+    for name, make_coro in (("yield [...]", _gather), ("gather(..., limit=100)", _gather_limit)):
+        tracemalloc.start()
+        start = time.perf_counter()
+        out = tinyio.Loop().run(make_coro(n))
+        duration = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        assert out == list(range(n))
+        outputs = sys.getsizeof(out) + sum(sys.getsizeof(x) for x in out if x > 256)
+        print(f"{name:>24} {peak / 1e6:>18.1f} {outputs / 1e6:>22.1f} {duration:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
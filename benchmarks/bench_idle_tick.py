@@ -0,0 +1,60 @@
+"""Measures the cost of the loop going idle, as a function of how many coroutines are parked.
+
+Each parked coroutine is waiting on an `Event` that is only set at the very end. A single 'ticker' coroutine then
+repeatedly sleeps for zero seconds, so that every iteration drains the ready queue and takes the loop through its idle
+path (cycle check + blocking wait) before the ticker is rescheduled.
+
+Run with `python benchmarks/bench_idle_tick.py`. The time per tick should stay roughly flat as the number of parked
+coroutines grows.
+"""
+
+import time
+
+import tinyio
+
+
+def _parked(event):
+    yield from event.wait()
+
+
+def _shared_child(event):
+    yield from event.wait()
+
+
+def _waits_on_shared(shared):
+    yield shared
+
+
+def _ticker(num_ticks, event, out):
+    # Warm up: let every parked coroutine take its first step and park itself.
+    for _ in range(10):
+        yield tinyio.sleep(0)
+    start = time.perf_counter()
+    for _ in range(num_ticks):
+        yield tinyio.sleep(0)
+    out.append((time.perf_counter() - start) / num_ticks)
+    event.set()
+
+
+def _main(num_parked, num_ticks, out):
+    event = tinyio.Event()
+    # Mix of independent coroutines, and coroutines sharing a dependency (which produces edges into already-running
+    # coroutines, i.e. the kind that a cycle check actually has to look at).
+    shared = _shared_child(event)
+    parked = [_parked(event) for _ in range(num_parked // 2)]
+    parked += [_waits_on_shared(shared) for _ in range(num_parked - len(parked))]
+    yield [_ticker(num_ticks, event, out), *parked]
+
+
+def main():
+    num_ticks = 200
+    print(f"{'parked coroutines':>20} {'time per idle tick (us)':>25}")
+    for num_parked in (100, 1_000, 10_000, 100_000):
+        out = []
+        tinyio.Loop().run(_main(num_parked, num_ticks, out))
+        [per_tick] = out
+        print(f"{num_parked:>20} {per_tick * 1e6:>25.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Throughput of a tinyio loop embedded inside `asyncio` or `trio`, compared to running it directly. Also the time
+taken to wake up each time the embedded loop blocks.
+
+Run with `python benchmarks/bench_integrations.py`.
+"""
+
+import asyncio
+import time
+
+import tinyio
+
+
+def _leaf():
+    yield
+    return 1
+
+
+def _work(n):
+    for _ in range(n):
+        yield _leaf()
+
+
+def _block(n, event):
+    for _ in range(n):
+        yield event.wait()
+        event.clear()
+
+
+async def _ping_asyncio(n, event):
+    for _ in range(n):
+        await asyncio.sleep(0)
+        event.set()
+        while event.is_set():
+            await asyncio.sleep(0)
+
+
+async def _ping_trio(n, event):
+    import trio
+
+    for _ in range(n):
+        await trio.sleep(0)
+        event.set()
+        while event.is_set():
+            await trio.sleep(0)
+
+
+def _time(name, fn, num_steps, scale=1e9):
+    start = time.perf_counter()
+    fn()
+    per_step = (time.perf_counter() - start) / num_steps
+    print(f"{name:>20} {per_step * scale:>15.0f}")
+
+
+def main():
+    n = 50_000
+    # Each `_leaf` is stepped twice, and the parent is stepped once.
+    num_steps = 3 * n
+    print(f"{'driver':>20} {'ns per step':>15}")
+    _time("tinyio.Loop().run", lambda: tinyio.Loop().run(_work(n)), num_steps)
+    _time("tinyio.to_asyncio", lambda: asyncio.run(tinyio.to_asyncio(_work(n))), num_steps)
+    try:
+        import trio
+    except ImportError:
+        pass
+    else:
+        _time("tinyio.to_trio", lambda: trio.run(tinyio.to_trio, _work(n)), num_steps)
+
+    # The embedded loop blocks on an event, which the host loop then sets.
+    n = 2_000
+    print(f"\n{'driver':>20} {'us per wakeup':>15}")
+
+    async def asyncio_main():
+        event = tinyio.Event()
+        await asyncio.gather(tinyio.to_asyncio(_block(n, event)), _ping_asyncio(n, event))
+
+    _time("tinyio.to_asyncio", lambda: asyncio.run(asyncio_main()), n, scale=1e6)
+    try:
+        import trio
+    except ImportError:
+        pass
+    else:
+
+        async def trio_main():
+            event = tinyio.Event()
+            async with trio.open_nursery() as nursery:
+                nursery.start_soon(_ping_trio, n, event)
+                await tinyio.to_trio(_block(n, event))
+
+        _time("tinyio.to_trio", lambda: trio.run(trio_main), n, scale=1e6)
+
+
+if __name__ == "__main__":
+    main()
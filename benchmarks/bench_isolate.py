@@ -0,0 +1,52 @@
+"""Cost per request of running each request in its own `tinyio.isolate` region, for requests that either finish
+straight away, wait on an event set by another coroutine, or fail.
+
+Run with `python benchmarks/bench_isolate.py`.
+"""
+
+import time
+
+import tinyio
+
+
+def _request(kind, event):
+    yield
+    if kind == "wait":
+        yield event.wait()
+    elif kind == "fail":
+        raise RuntimeError("Kaboom")
+    return kind
+
+
+def _handle(kind, event):
+    out, success = yield tinyio.isolate(_request(kind, event))
+    assert success == (kind != "fail")
+
+
+def _set_later(event):
+    # Long enough for every request to be blocked on `event` by the time it is set.
+    for _ in range(3):
+        yield
+    event.set()
+
+
+def _main(kind, n):
+    for _ in range(n // 100):
+        event = tinyio.Event()
+        yield [_set_later(event), *[_handle(kind, event) for _ in range(100)]]
+
+
+def main():
+    n = 5_000
+    print(f"{'request':>8} {'time per request (us)':>22}")
+    for kind in ("return", "wait", "fail"):
+        best = float("inf")
+        for _ in range(5):
+            start = time.perf_counter()
+            tinyio.Loop().run(_main(kind, n))
+            best = min(best, time.perf_counter() - start)
+        print(f"{kind:>8} {1e6 * best / n:>22.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""Runs several independent loops at once, one per thread, each passing values back and forth through `Event`s.
+
+Run with `python benchmarks/bench_multi_loop.py`. Independent loops share no locks, so total throughput should not
+collapse as the number of loops grows. (Under the GIL it will not go *up* either; this is measuring contention, not
+parallelism.)
+"""
+
+import threading
+import time
+
+import tinyio
+
+
+def _ping_pong(n):
+    ping = tinyio.Event()
+    pong = tinyio.Event()
+
+    def pinger():
+        for _ in range(n):
+            ping.set()
+            yield pong.wait()
+            pong.clear()
+
+    def ponger():
+        for _ in range(n):
+            yield ping.wait()
+            ping.clear()
+            pong.set()
+
+    yield [pinger(), ponger()]
+
+
+def _run_loops(num_loops, n):
+    threads = [threading.Thread(target=tinyio.Loop().run, args=(_ping_pong(n),)) for _ in range(num_loops)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return time.perf_counter() - start
+
+
+def main():
+    n = 20_000
+    print(f"{'loops':>6} {'total handoffs/s':>18}")
+    for num_loops in (1, 2, 4, 8, 16):
+        duration = min(_run_loops(num_loops, n) for _ in range(3))
+        print(f"{num_loops:>6} {num_loops * n / duration:>18.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Cost per child of spawning a changing set of background workers one at a time and then joining on all of them:
+with a `tinyio.Nursery`, against doing the bookkeeping by hand with an event per child.
+
+For reference, a static `yield [...]` over the same children is also shown.
+
+Run with `python benchmarks/bench_nursery.py`.
+"""
+
+import time
+
+import tinyio
+
+
+def _child():
+    yield
+
+
+def _static(n):
+    yield [_child() for _ in range(n)]
+
+
+def _by_hand(n):
+    events = []
+
+    def wrapper(coro, event):
+        yield coro
+        event.set()
+
+    for _ in range(n):
+        event = tinyio.Event()
+        events.append(event)
+        yield {wrapper(_child(), event)}
+    yield [event.wait() for event in events]
+
+
+def _nursery(n):
+    nursery = tinyio.Nursery()
+    for _ in range(n):
+        yield nursery.spawn(_child())
+    yield nursery.join()
+
+
+def main():
+    n = 100_000
+    print(f"{'':>14} {'time per child (us)':>20}")
+    for name, make_coro in (("yield [...]", _static), ("event per child", _by_hand), ("Nursery", _nursery)):
+        best = float("inf")
+        for _ in range(5):
+            start = time.perf_counter()
+            tinyio.Loop().run(make_coro(n))
+            best = min(best, time.perf_counter() - start)
+        print(f"{name:>14} {1e6 * best / n:>20.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""Latency of a short request handler, whilst the loop is kept busy by many batch-style coroutines that keep
+yielding. Compares running the handler in the same lane as the batch work, against giving it priority over it.
+
+Run with `python benchmarks/bench_priority.py`.
+"""
+
+import time
+
+import tinyio
+
+
+def _batch_job(done):
+    while not done:
+        yield
+
+
+def _handler(num_steps):
+    start = time.perf_counter()
+    for _ in range(num_steps):
+        yield
+    return time.perf_counter() - start
+
+
+def _main(num_batch, handler_lane, out):
+    done = []
+    jobs = [_batch_job(done) for _ in range(num_batch)]
+    handler = _handler(100)
+    if handler_lane is not None:
+        handler = tinyio.priority(handler, handler_lane)
+    # Let the batch jobs get going first.
+    yield {tinyio.priority(job, "low") if handler_lane is not None else job for job in jobs}
+    yield
+    out.append((yield handler))
+    done.append(True)
+
+
+def main():
+    print(f"{'batch coroutines':>20} {'handler latency, same lane (ms)':>35} {'prioritised (ms)':>20}")
+    for num_batch in (100, 1_000, 10_000):
+        out = []
+        tinyio.Loop().run(_main(num_batch, None, out))
+        tinyio.Loop().run(_main(num_batch, "high", out))
+        same, prioritised = out
+        print(f"{num_batch:>20} {same * 1e3:>35.2f} {prioritised * 1e3:>20.2f}")
+
+
+if __name__ == "__main__":
+    main()
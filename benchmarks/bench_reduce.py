@@ -0,0 +1,47 @@
+"""Peak memory of a large map job, whose outputs are combined into a single summary value: gathering every output
+with `yield [...]`, against folding them in as they arrive with `tinyio.reduce`.
+
+Run with `python benchmarks/bench_reduce.py`.
+"""
+
+import time
+import tracemalloc
+
+import tinyio
+
+
+def _child(i):
+    yield
+    # Something moderately large.
+    return bytes(1_000) + bytes([i % 256])
+
+
+def _gather(n):
+    outs = yield [_child(i) for i in range(n)]
+    return sum(len(out) for out in outs)
+
+
+def _reduce(n):
+    return (yield tinyio.reduce(lambda total, out: total + len(out), (_child(i) for i in range(n)), 0))
+
+
+def main():
+    n = 200_000
+    print(f"{'':>34} {'peak memory (MB)':>18} {'time (s)':>10}")
+    for name, make_coro, max_active in (
+        ("yield [...]", _gather, None),
+        ("tinyio.reduce", _reduce, None),
+        ("tinyio.reduce, max_active=1000", _reduce, 1_000),
+    ):
+        tracemalloc.start()
+        start = time.perf_counter()
+        out = tinyio.Loop(max_active=max_active).run(make_coro(n))
+        duration = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        assert out == 1_001 * n
+        print(f"{name:>34} {peak / 1e6:>18.1f} {duration:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
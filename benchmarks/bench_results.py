@@ -0,0 +1,40 @@
+"""Memory retained by a long-lived loop, when something still references coroutines that returned large values,
+for each `tinyio.Loop(max_results=...)`.
+
+Run with `python benchmarks/bench_results.py`.
+"""
+
+import tracemalloc
+
+import tinyio
+
+
+def _decode(i):
+    yield
+    return bytes(100_000) + bytes([i % 256])
+
+
+def _request(i, history):
+    # E.g. some bookkeeping that holds on to the coroutine after it has finished.
+    coro = _decode(i)
+    history.append(coro)
+    payload = yield coro
+    return len(payload)
+
+
+def main():
+    num_requests = 1_000
+    print(f"{'max_results':>12} {'retained after all requests (MB)':>34}")
+    for max_results in (None, 100, 0):
+        loop = tinyio.Loop(max_results=max_results)
+        history = []
+        tracemalloc.start()
+        for i in range(num_requests):
+            loop.run(_request(i, history))
+        retained, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"{str(max_results):>12} {retained / 1e6:>34.1f}")
+
+
+if __name__ == "__main__":
+    main()
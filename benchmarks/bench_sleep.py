@@ -0,0 +1,50 @@
+"""Memory used per sleeping coroutine, with a million coroutines all asleep at once (think poll loops or backoffs).
+
+Run with `python benchmarks/bench_sleep.py [num_sleepers]`.
+"""
+
+import sys
+import time
+import tracemalloc
+
+import tinyio
+
+
+class _Stop(Exception):
+    pass
+
+
+def _sleeper():
+    yield tinyio.sleep(3600)
+
+
+def _main(n):
+    yield [_sleeper() for _ in range(n)]
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    tracemalloc.start()
+    baseline, _ = tracemalloc.get_traced_memory()
+    current = baseline
+    duration = 0.0
+    start = time.perf_counter()
+    try:
+        with tinyio.Loop().runtime(_main(n), exception_group=False, max_steps=None) as gen:
+            # Run until every coroutine is asleep and the loop is blocked...
+            wait = next(gen)
+            assert wait is not None
+            duration = time.perf_counter() - start
+            current, _ = tracemalloc.get_traced_memory()
+            # ...and then shut it down.
+            raise _Stop
+    except _Stop:
+        pass
+    tracemalloc.stop()
+    # The list of coroutines passed to `yield [...]` is not included: it is the same either way.
+    print(f"{'sleepers':>10} {'bytes per sleeper':>18} {'time to fall asleep (s)':>24}")
+    print(f"{n:>10} {(current - baseline) / n:>18.0f} {duration:>24.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Latency of waking up a blocked loop, as a function of `tinyio.Loop(max_spin=...)`:
+
+- a round trip to a long-lived worker thread, which sets a `tinyio.Event` as soon as it is asked to;
+- a round trip via `tinyio.run_in_thread` on a function that returns immediately (which includes starting a thread);
+- how much a very short `tinyio.sleep` overshoots by.
+
+Run with `python benchmarks/bench_spin.py`.
+"""
+
+import queue
+import statistics
+import threading
+import time
+
+import tinyio
+
+
+def _worker(requests):
+    while (event := requests.get()) is not None:
+        event.set()
+
+
+def _worker_round_trips(n, out):
+    requests = queue.SimpleQueue()
+    thread = threading.Thread(target=_worker, args=(requests,))
+    thread.start()
+    try:
+        for _ in range(n):
+            start = time.perf_counter()
+            event = tinyio.Event()
+            requests.put(event)
+            yield event.wait()
+            out.append(time.perf_counter() - start)
+    finally:
+        requests.put(None)
+        thread.join()
+
+
+def _noop():
+    pass
+
+
+def _thread_round_trips(n, out):
+    for _ in range(n):
+        start = time.perf_counter()
+        yield tinyio.run_in_thread(_noop)
+        out.append(time.perf_counter() - start)
+
+
+def _sleeps(n, delay, out):
+    for _ in range(n):
+        start = time.perf_counter()
+        yield tinyio.sleep(delay)
+        out.append(time.perf_counter() - start - delay)
+
+
+def _us(xs):
+    xs = sorted(xs)
+    return statistics.median(xs) * 1e6, xs[int(0.99 * len(xs))] * 1e6
+
+
+def main():
+    n = 2_000
+    delay = 2e-4
+    print(f"{'max_spin (us)':>14} {'p50 (us)':>10} {'p99 (us)':>10}")
+    for name, make in (
+        ("worker thread round trip", lambda out: _worker_round_trips(n, out)),
+        ("run_in_thread round trip", lambda out: _thread_round_trips(n, out)),
+        (f"sleep({delay}) overshoot", lambda out: _sleeps(n, delay, out)),
+    ):
+        print(name)
+        for max_spin in (0, 1e-4, 1e-3):
+            out = []
+            tinyio.Loop(max_spin=max_spin).run(make(out))
+            p50, p99 = _us(out)
+            print(f"{max_spin * 1e6:>14.0f} {p50:>10.0f} {p99:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""Work left behind after a batch of timed-out requests. Each request schedules some background work of its own, and
+then times out. Reports how many of those background coroutines are still alive once every request has returned.
+
+Run with `python benchmarks/bench_timeout_cancel.py`.
+"""
+
+import gc
+import time
+import weakref
+
+import tinyio
+
+
+def _background():
+    for _ in range(100):
+        yield tinyio.sleep(0.01)
+
+
+def _request(alive):
+    background = [_background() for _ in range(10)]
+    alive.update(background)
+    yield set(background)
+    del background
+    yield tinyio.sleep(1)
+
+
+def _main(n):
+    alive = weakref.WeakSet()
+    start = time.perf_counter()
+    yield [tinyio.timeout(_request(alive), 0.2) for _ in range(n)]
+    duration = time.perf_counter() - start
+    gc.collect()
+    print(f"{n:>10} {len(alive):>28} {duration:>10.2f}")
+
+
+def main():
+    print(f"{'requests':>10} {'background still alive':>28} {'time (s)':>10}")
+    for n in (100, 1_000, 10_000):
+        tinyio.Loop().run(_main(n))
+
+
+if __name__ == "__main__":
+    main()
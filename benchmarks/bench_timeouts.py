@@ -0,0 +1,42 @@
+"""Timeouts that almost never fire: each wait is on an event that is already set, but has a long timeout attached.
+Meanwhile one other coroutine is waiting with a shorter timeout, so that its timeout is always the soonest.
+
+Run with `python benchmarks/bench_timeouts.py`. Reports the time per wait, and how much memory is still held by the
+loop's timeout bookkeeping at the end (which should not grow with the number of waits).
+"""
+
+import time
+import tracemalloc
+
+import tinyio
+
+
+def _waits(n, measure_memory, out):
+    event = tinyio.Event()
+    event.set()
+    guard = tinyio.Event()
+    yield {guard.wait(timeout_in_seconds=1000)}
+    if measure_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    for _ in range(n):
+        yield from event.wait(timeout_in_seconds=2000)
+    out.append((time.perf_counter() - start) / n)
+    if measure_memory:
+        out.append(tracemalloc.get_traced_memory()[0])
+        tracemalloc.stop()
+    guard.set()
+
+
+def main():
+    print(f"{'waits':>10} {'time per wait (us)':>20} {'memory still held (KB)':>24}")
+    for n in (10_000, 100_000, 1_000_000):
+        out = []
+        tinyio.Loop().run(_waits(n, False, out))
+        tinyio.Loop().run(_waits(n, True, out))
+        per_wait, _, memory = out
+        print(f"{n:>10} {per_wait * 1e6:>20.2f} {memory / 1024:>24.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Many timers expiring close together: how often the loop wakes up, and how late the timers fire, as a function of
+`tinyio.Loop(timer_slack=...)`.
+
+Run with `python benchmarks/bench_timer_slack.py`. Each of the sleepers wakes up at its own point in a short window, so
+without slack the loop wakes up separately for (nearly) every one of them.
+"""
+
+import time
+
+import tinyio
+
+
+def _sleeper(deadline, lateness):
+    yield tinyio.sleep_until(deadline)
+    lateness.append(time.monotonic() - deadline)
+
+
+def _main(num_sleepers, window, lateness):
+    start = time.monotonic() + 0.05
+    yield [_sleeper(start + window * i / num_sleepers, lateness) for i in range(num_sleepers)]
+
+
+def _run(timer_slack, num_sleepers, window):
+    lateness = []
+    num_wakeups = 0
+    cpu_start = time.process_time()
+    with tinyio.Loop(timer_slack=timer_slack).runtime(
+        _main(num_sleepers, window, lateness), exception_group=None, max_steps=None
+    ) as gen:
+        while True:
+            try:
+                wait = next(gen)
+            except StopIteration:
+                break
+            if wait is not None:
+                num_wakeups += 1
+                wait()
+    cpu = time.process_time() - cpu_start
+    return num_wakeups, cpu, sum(lateness) / len(lateness), max(lateness)
+
+
+def main():
+    num_sleepers = 2_000
+    window = 1.0
+    print(f"{num_sleepers} sleepers spread over {window}s")
+    print(
+        f"{'timer_slack (ms)':>18} {'wakeups':>10} {'CPU time (ms)':>15} {'mean late (ms)':>16} {'max late (ms)':>15}"
+    )
+    for timer_slack in (0, 1e-4, 1e-3, 5e-3):
+        num_wakeups, cpu, mean_late, max_late = _run(timer_slack, num_sleepers, window)
+        print(
+            f"{timer_slack * 1e3:>18.1f} {num_wakeups:>10} {cpu * 1e3:>15.1f} {mean_late * 1e3:>16.2f} "
+            f"{max_late * 1e3:>15.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,6 @@
+import time
+
+import pytest
 import tinyio
 
 
@@ -30,3 +33,129 @@ def test_as_completed_out_of_order():
 
     loop = tinyio.Loop()
     assert loop.run(_run()) == [0.1, 0.2, 0.3]
+
+
+@pytest.mark.parametrize("limit", (None, 1, 3, 100))
+def test_gather(limit):
+    def _run():
+        coros = [_sleep(0.03), _sleep(0.01), _sleep(0.02), _sleep(0), _sleep(0.01)]
+        return (yield tinyio.gather(coros, limit=limit))
+
+    loop = tinyio.Loop()
+    assert loop.run(_run()) == [0.03, 0.01, 0.02, 0, 0.01]
+
+
+def test_gather_lazy():
+    in_flight = 0
+    max_in_flight = 0
+
+    def _child(i):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        yield tinyio.sleep(0.001 * (i % 3))
+        in_flight -= 1
+        return i
+
+    def _source():
+        for i in range(20):
+            # Only pulled once a slot has freed up.
+            assert in_flight < 4
+            yield lambda i=i: _child(i)
+
+    loop = tinyio.Loop()
+    assert loop.run(tinyio.gather(_source(), limit=4)) == list(range(20))
+    assert max_in_flight == 4
+
+
+def test_gather_large_limit():
+    # Only as many workers as there are items are started, not `limit` of them.
+    start = time.monotonic()
+    assert tinyio.Loop().run(tinyio.gather([_sleep(0), _sleep(0.01)], limit=10**6)) == [0, 0.01]
+    assert time.monotonic() - start < 1
+
+
+def test_gather_invalid():
+    with pytest.raises(ValueError, match="limit"):
+        tinyio.gather([], limit=0)
+    # `coros` is only pulled from lazily, so its elements are checked once the loop runs.
+    with pytest.raises(ValueError, match="coroutines"):
+        tinyio.Loop().run(tinyio.gather([1], limit=2))  # pyright: ignore[reportArgumentType]
+
+
+def test_nursery():
+    def _run():
+        nursery = tinyio.Nursery()
+        assert len(nursery) == 0
+        yield nursery.join()
+        first = yield nursery.spawn(_sleep(0.01))
+        second = yield nursery.spawn(_sleep(0.2))
+        third = yield nursery.spawn(_sleep(0.02))
+        assert len(nursery) == 3
+        out = yield nursery.join([third, first])
+        assert out == [0.02, 0.01]
+        assert len(nursery) == 1
+        # Joining on an already-finished child is fine too.
+        out = yield nursery.join([first])
+        assert out == [0.01]
+        yield nursery.join()
+        assert len(nursery) == 0
+        out = yield nursery.join([second])
+        assert out == [0.2]
+
+    loop = tinyio.Loop()
+    loop.run(_run())
+
+
+def test_nursery_spawn_while_joining():
+    outs = []
+
+    def _child(nursery, i):
+        yield tinyio.sleep(0.01)
+        outs.append(i)
+        if i < 5:
+            yield nursery.spawn(_child(nursery, i + 1))
+
+    def _run():
+        nursery = tinyio.Nursery()
+        yield nursery.spawn(_child(nursery, 0))
+        yield nursery.join()
+        assert outs == [0, 1, 2, 3, 4, 5]
+
+    loop = tinyio.Loop()
+    loop.run(_run())
+
+
+def test_nursery_cancelled():
+    nursery = tinyio.Nursery()
+
+    def _spawn():
+        yield nursery.spawn(_sleep(10))
+        yield nursery.join()
+
+    def _run():
+        out = yield tinyio.timeout(_spawn(), 0.05)
+        assert out == (None, False)
+        assert len(nursery) == 0
+        yield nursery.join()
+
+    start = time.monotonic()
+    tinyio.Loop().run(_run())
+    assert time.monotonic() - start < 1
+
+
+def test_nursery_error():
+    def _fail():
+        yield
+        raise RuntimeError("Kaboom")
+
+    def _run():
+        nursery = tinyio.Nursery()
+        yield nursery.spawn(_fail())
+        yield nursery.join()
+
+    loop = tinyio.Loop()
+    with pytest.raises(RuntimeError, match="Kaboom"):
+        loop.run(_run())
+    with pytest.raises(ValueError, match="coroutine"):
+        tinyio.Nursery().spawn(1)  # pyright: ignore[reportArgumentType]
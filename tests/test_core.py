@@ -1,5 +1,9 @@
 import contextlib
 import gc
+import math
+import operator
+import os
+import select
 import threading
 import time
 import weakref
@@ -77,6 +81,26 @@ def test_diamond():
     assert loop.run(_diamond1(2)) == 9
 
 
+def test_gather_mixed():
+    # Every kind of thing that can be gathered, to check that each result ends up in the right place.
+    event = tinyio.Event()
+
+    def _setter():
+        yield
+        event.set()
+        return "setter"
+
+    def _main():
+        finished = _add_one(1)
+        assert (yield finished) == 2
+        live = _setter()
+        out = yield [_add_one(3), finished, live, event.wait(), live, _add_one(5)]
+        return out, (yield finished), (yield live)
+
+    loop = tinyio.Loop()
+    assert loop.run(_main()) == ([4, 2, "setter", None, "setter", 6], 2, "setter")
+
+
 def test_sleep():
     def _slow_add_one(x: int):
         yield tinyio.sleep(0.1)
@@ -273,11 +297,11 @@ def test_gc_after_event(yield_from, timeout):
     In this case we have that:
     - `f1` has `timeout=10` but triggers immediately.
     - `f2` has `timeout=2` but triggers at the end of our main coroutine.
-    And so we have that `f2` is before of `f1` in the internal heap of timeouts, but that `f1` will trigger first.
-    Thus when `f1` triggers it will remain in that heap even after it has triggered (until `f2` has triggered as well
-    and they can both be popped).
-    In this scenario, we don't want the generator object to remain in memory just because it's still sitting in that
-    heap!
+    And so we have that `f2` is before of `f1` in the internal collection of timeouts, but that `f1` will trigger
+    first. (Historically this was a heap, and `f1` would remain in that heap even after it had triggered, until `f2` had
+    triggered as well and they could both be popped.)
+    In this scenario, we don't want the generator object to remain in memory just because its timeout is still sitting
+    around!
     This test checks that the generator can be cleaned up even whilst we wait for the `_Wait` object to get collected
     later.
     """
@@ -581,3 +605,643 @@ def test_runtime_leave_without_finishing():
 
     with pytest.raises(RuntimeError, match="only partially completed"):
         foo()
+
+
+@pytest.mark.parametrize("wakeup", ("eventfd", "pipe", "socketpair"))
+def test_wakeup(wakeup):
+    if wakeup not in tinyio._utils.available_wakeups():  # pyright: ignore[reportAttributeAccessIssue]
+        pytest.skip(f"`{wakeup}` is not available on this platform.")
+
+    def _blocking_add_one(x):
+        time.sleep(0.05)
+        return x + 1
+
+    def f():
+        x = yield tinyio.run_in_thread(_blocking_add_one, 1)
+        yield tinyio.sleep(0.01)
+        return x
+
+    loop = tinyio.Loop(wakeup=wakeup)
+    start = time.monotonic()
+    assert loop.run(f()) == 2
+    assert loop.run(f()) == 2
+    assert time.monotonic() - start < 0.5
+
+
+def test_invalid_wakeup():
+    with pytest.raises(ValueError, match="Invalid `wakeup="):
+        tinyio.Loop(wakeup="carrier-pigeon")  # pyright: ignore[reportArgumentType]
+
+
+def test_max_spin():
+    def _blocking_add_one(x):
+        time.sleep(0.01)
+        return x + 1
+
+    def f():
+        x = yield tinyio.run_in_thread(_blocking_add_one, 1)
+        y = yield tinyio.run_in_thread(_blocking_add_one, x)
+        overshoots = []
+        for _ in range(20):
+            start = time.monotonic()
+            yield tinyio.sleep(2e-4)
+            overshoots.append(time.monotonic() - start - 2e-4)
+        return y, sorted(overshoots)
+
+    y, overshoots = tinyio.Loop(max_spin=1e-3).run(f())
+    assert y == 3
+    # Without spinning, we'd block in the kernel for a whole millisecond.
+    assert overshoots[len(overshoots) // 2] < 5e-4
+
+    with pytest.raises(ValueError, match="max_spin"):
+        tinyio.Loop(max_spin=-1)
+
+
+def test_max_spin_adapts():
+    wake_loop = tinyio._utils.EventWithFileno(max_spin=0.01)  # pyright: ignore[reportAttributeAccessIssue]
+    try:
+        # Spinning didn't pay off, so we spin for less next time...
+        wake_loop.wait(timeout=0.05)
+        assert wake_loop._spin == pytest.approx(0.005)
+        # ...but waits shorter than `max_spin` are just spun out, and don't count.
+        wake_loop.wait(timeout=0.002)
+        assert wake_loop._spin == pytest.approx(0.005)
+        # Being woken up quickly makes it worthwhile to spin for longer again.
+        timer = threading.Timer(0.003, wake_loop.set)
+        timer.start()
+        wake_loop.wait(timeout=1)
+        timer.join()
+        assert 0.005 < wake_loop._spin <= 0.01
+    finally:
+        wake_loop.close()
+
+
+def test_many_fds():
+    # `select.select` cannot handle fds above `FD_SETSIZE` (1024). Check that the loop still blocks properly rather
+    # than busy-looping.
+    resource = pytest.importorskip("resource")
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft != resource.RLIM_INFINITY and soft < 2100:
+        if hard != resource.RLIM_INFINITY and hard < 2100:
+            pytest.skip("Cannot open enough file descriptors.")
+        resource.setrlimit(resource.RLIMIT_NOFILE, (2100, hard))
+    fds = []
+    try:
+        for _ in range(1000):
+            fds.extend(os.pipe())
+
+        def _blocking_add_one(x):
+            time.sleep(0.05)
+            return x + 1
+
+        def f():
+            yield tinyio.sleep(0.1)
+            return (yield tinyio.run_in_thread(_blocking_add_one, 1))
+
+        num_waits = 0
+        with tinyio.Loop().runtime(f(), exception_group=None) as gen:
+            while True:
+                try:
+                    wait = next(gen)
+                except StopIteration as e:
+                    out = e.value
+                    break
+                if wait is not None:
+                    num_waits += 1
+                    wait()
+        assert out == 2
+        # One wait for the sleep and one for the thread; leave a bit of slack for spurious wakeups.
+        assert num_waits < 10
+    finally:
+        for fd in fds:
+            os.close(fd)
+        resource.setrlimit(resource.RLIMIT_NOFILE, (soft, hard))
+
+
+def test_timer_wheel():
+    wheel = tinyio._core._TimerWheel(resolution=0.01)
+    event = tinyio.Event()
+    waits = [tinyio._core._Wait(event, None) for _ in range(5)]
+    for wait, timeout in zip(waits, [1.0, 1.001, 1.5, 100.0, 1.002]):
+        wait.timeout_in_seconds = timeout
+        wheel.add(wait)
+    assert len(wheel) == 5
+    # We may wake up to one bucket early...
+    assert 0.49 <= wheel.next_timeout(0.5) <= 0.5  # pyright: ignore[reportOperatorIssue, reportOptionalOperand]
+    # ...and then within the bucket, we look at the exact timeouts.
+    assert wheel.next_timeout(0.9995) == pytest.approx(0.0005)
+    wheel.remove(waits[4])
+    assert len(wheel) == 4
+    assert wheel.pop_expired(1.0005) == [waits[0]]
+    assert wheel.pop_expired(1.2) == [waits[1]]
+    assert 0.29 <= wheel.next_timeout(1.2) <= 0.3  # pyright: ignore[reportOperatorIssue, reportOptionalOperand]
+    # Removing something that has already been popped is a no-op.
+    wheel.remove(waits[1])
+    wheel.remove(waits[2])
+    assert len(wheel) == 1
+    assert wheel.pop_expired(99.0) == []
+    assert 0.99 <= wheel.next_timeout(99.0) <= 1.0  # pyright: ignore[reportOperatorIssue, reportOptionalOperand]
+    assert wheel.pop_expired(100.0) == [waits[3]]
+    assert len(wheel) == 0
+    assert wheel.next_timeout(100.0) is None
+
+
+def test_infinite_timeout():
+    def _set(event):
+        yield tinyio.sleep(0.01)
+        event.set()
+
+    def _main():
+        event = tinyio.Event()
+        yield {_set(event)}
+        yield event.wait(timeout_in_seconds=math.inf)
+        out = yield tinyio.timeout(tinyio.sleep(math.inf), 0.01)
+        assert out == (None, False)
+        return event.is_set()
+
+    assert tinyio.Loop().run(_main())
+
+
+def test_timer_wheel_slack():
+    wheel = tinyio._core._TimerWheel(resolution=0.25, slack=0.5)
+    event = tinyio.Event()
+    waits = [tinyio._core._Wait(event, None) for _ in range(2)]
+    for wait, timeout in zip(waits, [1.0, 1.25]):
+        wait.timeout_in_seconds = timeout
+        wheel.add(wait)
+    # We wake up `slack` later than we otherwise would...
+    assert wheel.next_timeout(0.5) == pytest.approx(1.0)
+    # ...at which point both have expired.
+    assert wheel.pop_expired(1.5) == waits
+
+
+def test_timer_slack():
+    def _sleeper(deadline):
+        yield tinyio.sleep_until(deadline)
+
+    def _main(start):
+        yield [_sleeper(start + i * 0.002) for i in range(20)]
+
+    def _count_wakeups(timer_slack):
+        num_wakeups = 0
+        start = time.monotonic() + 0.01
+        with tinyio.Loop(timer_slack=timer_slack).runtime(_main(start), exception_group=None, max_steps=None) as gen:
+            while True:
+                try:
+                    wait = next(gen)
+                except StopIteration:
+                    break
+                if wait is not None:
+                    num_wakeups += 1
+                    wait()
+        return num_wakeups, time.monotonic() - start
+
+    num_wakeups, duration = _count_wakeups(0)
+    assert num_wakeups >= 10
+    num_wakeups, duration = _count_wakeups(0.1)
+    assert num_wakeups <= 2
+    # Slightly less than `timer_slack`, as we may wake up up to a millisecond early.
+    assert 0.09 <= duration < 0.5
+
+    with pytest.raises(ValueError, match="timer_slack"):
+        tinyio.Loop(timer_slack=-1)
+
+
+@pytest.mark.parametrize("max_steps", (1, 10, None))
+def test_runtime_max_steps(max_steps):
+    def f():
+        for _ in range(100):
+            yield
+
+    num_yields = 0
+    with tinyio.Loop().runtime(f(), exception_group=None, max_steps=max_steps) as gen:
+        while True:
+            try:
+                wait = next(gen)
+            except StopIteration:
+                break
+            assert wait is None
+            num_yields += 1
+    # 101 steps: 100 yields and then the return.
+    if max_steps is None:
+        assert num_yields == 0
+    else:
+        assert num_yields == 101 // max_steps
+
+
+def test_runtime_max_time():
+    def f():
+        for _ in range(20):
+            time.sleep(0.01)
+            yield
+
+    num_yields = 0
+    with tinyio.Loop().runtime(f(), exception_group=None, max_steps=None, max_time=0.025) as gen:
+        while True:
+            try:
+                next(gen)
+            except StopIteration:
+                break
+            num_yields += 1
+    assert 4 <= num_yields <= 11
+
+
+def test_runtime_wait_descriptor():
+    event = tinyio.Event()
+
+    def f():
+        yield event.wait(10)
+
+    with tinyio.Loop().runtime(f(), exception_group=None, max_steps=None) as gen:
+        wait = next(gen)
+        assert wait is not None
+        assert wait.deadline is not None
+        assert 9 < wait.deadline - time.monotonic() <= 10
+        with wait as woken:
+            assert not woken
+            assert select.select([wait.fileno()], [], [], 0)[0] == []
+            # Set from another thread: this should be visible through the fd.
+            thread = threading.Thread(target=event.set)
+            thread.start()
+            thread.join()
+            assert select.select([wait.fileno()], [], [], 1)[0] == [wait.fileno()]
+        with pytest.raises(StopIteration):
+            next(gen)
+
+
+def test_runtime_invalid_budget():
+    def f():
+        yield
+
+    with pytest.raises(ValueError, match="max_steps"):
+        tinyio.Loop().runtime(f(), exception_group=None, max_steps=0)
+
+
+def test_priority():
+    order = []
+
+    def _record(name, n):
+        for _ in range(n):
+            yield
+        order.append(name)
+
+    def _child(name):
+        yield _record(name, 3)
+
+    def _main():
+        yield [
+            tinyio.priority(_record("idle", 1), "idle"),
+            tinyio.priority(_record("low", 3), "low"),
+            _record("normal", 3),
+            # The child of a high coroutine inherits its lane...
+            tinyio.priority(_child("high"), "high"),
+            # ...unless asked otherwise.
+            tinyio.priority(_child("high-then-low"), "low"),
+        ]
+
+    tinyio.Loop().run(_main())
+    assert order == ["high", "normal", "low", "high-then-low", "idle"]
+
+
+def test_priority_starvation():
+    progress = []
+
+    def _busy():
+        for _ in range(1000):
+            yield
+        progress.append("busy")
+
+    def _starved():
+        yield
+        progress.append("starved")
+
+    def _main():
+        yield [tinyio.priority(_busy(), "high"), tinyio.priority(_starved(), "low")]
+
+    tinyio.Loop().run(_main())
+    assert progress == ["starved", "busy"]
+
+
+def test_priority_already_started():
+    def _main():
+        coro = _add_one(1)
+        yield {coro}
+        # `coro` is already running in the normal lane, so this is the same as just waiting on it.
+        x = yield tinyio.priority(coro, "idle")
+        y = yield tinyio.priority(coro, "high")
+        return x, y
+
+    assert tinyio.Loop().run(_main()) == (2, 2)
+
+
+def test_priority_invalid():
+    with pytest.raises(ValueError, match="lane"):
+        tinyio.priority(_add_one(1), "urgent")  # pyright: ignore[reportArgumentType]
+    with pytest.raises(ValueError, match="not a coroutine"):
+        tinyio.priority(1, "high")  # pyright: ignore[reportArgumentType]
+
+
+@pytest.mark.parametrize("scheduling", ("fifo", "deadline"))
+def test_deadline(scheduling):
+    order = []
+    # Make everything start racing at the same time.
+    start = tinyio.Event()
+
+    def _record(name):
+        yield start.wait()
+        for _ in range(3):
+            yield
+        order.append(name)
+
+    def _child(name):
+        yield _record(name)
+
+    def _start():
+        for _ in range(5):
+            yield
+        start.set()
+
+    def _main():
+        now = time.monotonic()
+        yield [
+            _start(),
+            _record("none"),
+            tinyio.deadline(_record("late"), now + 30),
+            # Inherited by the child...
+            tinyio.deadline(_child("early"), now + 10),
+            # ...and can only be brought forward, not pushed back.
+            tinyio.deadline(_child_with_deadline("middle", now + 40), now + 20),
+            tinyio.timeout(_record("timeout"), 25),
+        ]
+
+    def _child_with_deadline(name, deadline):
+        yield tinyio.deadline(_record(name), deadline)
+
+    tinyio.Loop(scheduling=scheduling).run(_main())
+    if scheduling == "fifo":
+        assert order == ["none", "late", "timeout", "early", "middle"]
+    else:
+        assert order == ["early", "middle", "timeout", "late", "none"]
+
+
+def test_invalid_scheduling():
+    with pytest.raises(ValueError, match="scheduling"):
+        tinyio.Loop(scheduling="lifo")  # pyright: ignore[reportArgumentType]
+
+
+@pytest.mark.parametrize("time_slice", (None, 0, 10))
+def test_checkpoint(time_slice):
+    interleaved = False
+    done = False
+
+    def _crunch():
+        for _ in range(100):
+            yield from tinyio.checkpoint()
+        nonlocal done
+        done = True
+
+    def _other():
+        yield
+        nonlocal interleaved
+        interleaved = not done
+
+    def _main():
+        yield [_crunch(), _other()]
+
+    tinyio.Loop(time_slice=time_slice).run(_main())
+    # Only with a long time slice does `_crunch` get to run to completion without interruption.
+    assert interleaved is (time_slice != 10)
+
+
+def test_time_used():
+    loop = tinyio.Loop(time_slice=1e-3)
+
+    def _busy():
+        for _ in range(5):
+            time.sleep(0.01)
+            yield
+
+    def _main():
+        busy = _busy()
+        yield {busy}
+        yield
+        assert loop.time_used(busy) > 0
+        yield busy
+        with pytest.raises(ValueError, match="not currently running"):
+            loop.time_used(busy)
+        return loop.time_used(main)
+
+    main = _main()
+    # `_main` itself does very little.
+    assert loop.run(main) < 0.01
+
+
+def test_time_used_after_error():
+    loop = tinyio.Loop(time_slice=1e-3)
+    refs = []
+
+    def _parked():
+        yield tinyio.Event().wait()
+
+    def _main():
+        parked = _parked()
+        refs.append(weakref.ref(parked))
+        yield {parked}
+        yield
+        del parked
+        raise RuntimeError("kaboom")
+
+    with pytest.raises(RuntimeError, match="kaboom"):
+        loop.run(_main())
+    gc.collect()
+    # The loop doesn't hold onto the coroutines from a crashed run.
+    assert refs[0]() is None
+
+
+def test_invalid_time_slice():
+    with pytest.raises(ValueError, match="time_slice"):
+        tinyio.Loop(time_slice=-1)
+
+
+def test_max_active():
+    running = 0
+    peak = 0
+
+    def _worker(x):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        for _ in range(3):
+            yield
+        running -= 1
+        return x
+
+    def _main():
+        return (yield [_worker(x) for x in range(100)])
+
+    # One of the ten is `_main` itself.
+    assert tinyio.Loop(max_active=10).run(_main()) == list(range(100))
+    assert peak == 9
+
+
+def test_max_active_nested():
+    # These would deadlock if we didn't always start one of the coroutines being waited on.
+    def _tree(depth):
+        if depth == 0:
+            yield
+            return 1
+        else:
+            return sum((yield [_tree(depth - 1) for _ in range(3)]))
+
+    def _chain(depth):
+        if depth == 0:
+            return 0
+            yield
+        else:
+            return 1 + (yield _chain(depth - 1))
+
+    assert tinyio.Loop(max_active=1).run(_tree(3)) == 27
+    assert tinyio.Loop(max_active=1).run(_chain(10)) == 10
+
+
+def test_max_active_background():
+    started = []
+
+    def _worker(x):
+        started.append(x)
+        yield
+        return x
+
+    def _main():
+        workers = [_worker(x) for x in range(5)]
+        yield set(workers)
+        yield
+        # Only one other coroutine can run alongside `_main`.
+        assert len(started) == 1
+        # Waiting on a held-back coroutine starts it, regardless of `max_active`.
+        assert (yield workers[4]) == 4
+        return (yield workers)
+
+    assert tinyio.Loop(max_active=2).run(_main()) == list(range(5))
+
+
+def test_invalid_max_active():
+    with pytest.raises(ValueError, match="max_active"):
+        tinyio.Loop(max_active=0)
+
+
+def test_max_results_zero():
+    def _main():
+        # Diamonds still work, so long as everyone is waiting at the same time.
+        x = _add_one(1)
+        y, z = yield [_diamond(x), _diamond(x)]
+        assert y == z == 2
+        # But afterwards the result is gone.
+        yield x
+
+    def _diamond(x):
+        return (yield x)
+
+    loop = tinyio.Loop(max_results=0)
+    assert loop.run(_add_two(1)) == 3
+    assert len(loop._results) == 0
+    with pytest.raises(tinyio.CancelledError, match="max_results"):
+        loop.run(_main())
+
+
+def test_max_results_lru():
+    a, b, c = _add_one(1), _add_one(2), _add_one(3)
+
+    def _main():
+        yield [a, b]
+        # Use `a`, so that `b` is now the least-recently-used...
+        assert (yield a) == 2
+        # ...and is discarded to make room for `c`.
+        yield c
+        assert (yield [a, c]) == [2, 4]
+        yield b
+
+    loop = tinyio.Loop(max_results=2)
+    with pytest.raises(tinyio.CancelledError, match="max_results"):
+        loop.run(_main())
+
+
+def test_invalid_max_results():
+    with pytest.raises(ValueError, match="max_results"):
+        tinyio.Loop(max_results=-1)
+
+
+def test_reduce():
+    def _main():
+        finished = _add_one(0)
+        yield finished
+        live = _add_one(10)
+        yield {live}
+        total = yield tinyio.reduce(operator.add, (c for c in [finished, live, _add_one(100)]), 1000)
+        assert total == 1000 + 1 + 11 + 101
+        # An empty reduce just gives back the initial value.
+        return (yield tinyio.reduce(operator.add, [], 5))
+
+    assert tinyio.Loop().run(_main()) == 5
+
+
+def test_reduce_order():
+    event = tinyio.Event()
+
+    def _slow():
+        yield event.wait()
+        return "slow"
+
+    def _fast():
+        yield
+        event.set()
+        return "fast"
+
+    def _main():
+        return (yield tinyio.reduce(lambda acc, x: [*acc, x], [_slow(), _fast()], []))
+
+    # Folded in the order they finish.
+    assert tinyio.Loop().run(_main()) == ["fast", "slow"]
+
+
+def test_reduce_releases_finished():
+    event = tinyio.Event()
+    refs = []
+
+    def _child(i):
+        if i > 0:
+            yield event.wait()
+        else:
+            yield
+        return i
+
+    def _coros():
+        for i in range(3):
+            coro = _child(i)
+            refs.append(weakref.ref(coro))
+            yield coro
+
+    def _check():
+        for _ in range(5):
+            yield
+        gc.collect()
+        # `_child(0)` has finished, and has already been freed, even though the others are still running.
+        assert [ref() is None for ref in refs] == [True, False, False]
+        event.set()
+
+    def _main():
+        total, _ = yield [tinyio.reduce(lambda acc, x: acc + x, _coros(), 0), _check()]
+        return total
+
+    assert tinyio.Loop().run(_main()) == 3
+
+
+def test_reduce_error():
+    def _fn(acc, x):
+        raise RuntimeError("Oh no")
+
+    def _main():
+        yield tinyio.reduce(_fn, [_add_one(1)], 0)
+
+    with pytest.raises(RuntimeError, match="Oh no"):
+        tinyio.Loop().run(_main())
@@ -1,9 +1,11 @@
 import contextlib
+import gc
 import os
 import pickle
 import signal
 import threading
 import time
+import weakref
 
 import pytest
 import tinyio
@@ -86,6 +88,64 @@ def test_cycle_misbehaving_coroutine_exception():
     assert _flat_tb(catcher.value) == ["test_cycle_misbehaving_coroutine_exception", "g"]
 
 
+def test_cycle_closed_after_idle():
+    # The loop goes idle (during the sleep) before the cycle is formed, so this checks that we still spot cycles that
+    # are built up over multiple steps.
+    def a():
+        yield bb
+
+    def b():
+        yield cc
+
+    def c():
+        yield tinyio.sleep(0.01)
+        yield aa
+
+    aa = a()
+    bb = b()
+    cc = c()
+    with pytest.raises(tinyio.CancelledError, match="Cycle detected in `tinyio` loop"):
+        tinyio.Loop().run(aa, exception_group=False)
+
+
+def test_no_cycle_diamond_after_idle():
+    def shared():
+        yield tinyio.sleep(0.01)
+        return 3
+
+    ss = shared()
+
+    def waiter():
+        return (yield ss)
+
+    def main():
+        return (yield [waiter() for _ in range(10)])
+
+    assert tinyio.Loop().run(main()) == [3] * 10
+
+
+def test_cycle_check_without_idle():
+    # A loop that never goes idle still checks (and then forgets) the waits it has seen, rather than holding onto every
+    # coroutine that has ever been waited on.
+    refs = []
+
+    def shared():
+        yield
+        return 1
+
+    def main():
+        for _ in range(5000):
+            ss = shared()
+            refs.append(weakref.ref(ss))
+            yield {ss}
+            yield ss
+            del ss
+        gc.collect()
+        assert sum(ref() is not None for ref in refs) < 2000
+
+    tinyio.Loop(max_results=0).run(main())
+
+
 @pytest.mark.parametrize("exception_group", (None, False, True))
 def test_propagation(exception_group):
     def f():
@@ -194,7 +254,7 @@ def test_catch_cancelled_raise_new_cancelled(exception_group):
         assert _flat_tb(a) == ["f", "g", "i"]
         assert type(b) is tinyio.CancelledError
         assert type(c) is tinyio.CancelledError
-        assert {tuple(_flat_tb(b)), tuple(_flat_tb(c))} == {("h",), ("sleep", "wait")}
+        assert {tuple(_flat_tb(b)), tuple(_flat_tb(c))} == {("h",), ("sleep",)}
     else:
         assert type(catcher.value) is RuntimeError
         assert str(catcher.value) == "kapow"
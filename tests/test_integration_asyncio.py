@@ -184,3 +184,26 @@ def test_tinyio_inside_asyncio_error_in_main():
     assert type(test_error) is _TestError
     assert str(test_error) == "asyncio error"
     assert tinyio_done
+
+
+def test_tinyio_inside_asyncio_without_threads():
+    event = tinyio.Event()
+
+    def _f():
+        yield tinyio.sleep(0.05)
+        yield event.wait()
+        return 3
+
+    def _no_threads(*args, **kwargs):
+        raise AssertionError("Should not use a thread to wait.")
+
+    async def _set():
+        await asyncio.sleep(0.1)
+        event.set()
+
+    async def f():
+        asyncio.get_running_loop().run_in_executor = _no_threads  # pyright: ignore[reportAttributeAccessIssue]
+        out, _ = await asyncio.gather(tinyio.to_asyncio(_f()), _set())
+        return out
+
+    assert asyncio.run(f()) == 3
@@ -187,3 +187,28 @@ def test_tinyio_inside_trio_error_in_main():
     assert type(test_error) is _TestError
     assert str(test_error) == "trio error"
     assert tinyio_done
+
+
+def test_tinyio_inside_trio_without_threads(monkeypatch):
+    event = tinyio.Event()
+
+    def _f():
+        yield tinyio.sleep(0.05)
+        yield event.wait()
+        return 3
+
+    def _no_threads(*args, **kwargs):
+        raise AssertionError("Should not use a thread to wait.")
+
+    monkeypatch.setattr(trio.to_thread, "run_sync", _no_threads)
+
+    async def _set():
+        await trio.sleep(0.1)
+        event.set()
+
+    async def f():
+        async with trio.open_nursery() as nursery:
+            nursery.start_soon(_set)
+            return await tinyio.to_trio(_f())
+
+    assert trio.run(f) == 3
@@ -1,3 +1,4 @@
+import time
 import warnings
 from collections.abc import Callable
 
@@ -185,3 +186,132 @@ def test_isolate_respects_cancellation():
         with pytest.raises(RuntimeError, match="Kaboom"):
             tinyio.Loop().run(bar())
     assert foo_cancelled
+
+
+def test_isolate_waits_for_background():
+    outs = []
+
+    def background():
+        yield tinyio.sleep(0.05)
+        outs.append("background")
+
+    def foo():
+        yield {background()}
+        outs.append("foo")
+        return 3
+
+    def bar():
+        out = yield tinyio.isolate(foo())
+        outs.append("bar")
+        return out
+
+    assert tinyio.Loop().run(bar()) == (3, True)
+    assert outs == ["foo", "background", "bar"]
+
+
+def test_isolate_deregisters_waits():
+    never = tinyio.Event()
+
+    def wait_forever():
+        yield [never.wait(), tinyio.sleep(100)]
+
+    def fail():
+        yield
+        raise RuntimeError("Kaboom")
+
+    def foo():
+        yield [wait_forever(), fail()]
+
+    def bar():
+        out, success = yield tinyio.isolate(foo())
+        assert not success
+        assert type(out) is RuntimeError
+        # The waits of the cancelled coroutines are removed, rather than waiting to be triggered.
+        yield
+        assert len(never._waits) == 0
+
+    start = time.monotonic()
+    tinyio.Loop().run(bar())
+    assert time.monotonic() - start < 5
+
+
+def test_isolate_nested():
+    inner_cancelled = False
+
+    def inner_forever():
+        nonlocal inner_cancelled
+        try:
+            while True:
+                yield
+        except tinyio.CancelledError:
+            inner_cancelled = True
+            raise
+
+    def inner_fail():
+        yield
+        raise ValueError("inner")
+
+    def outer():
+        # An error in a nested region doesn't affect the outer region...
+        out, success = yield tinyio.isolate(inner_fail())
+        assert not success
+        assert str(out) == "inner"
+        # ...but an error in the outer region cancels the nested regions.
+        yield {tinyio.isolate(inner_forever())}
+        yield
+        raise ValueError("outer")
+
+    def main():
+        return (yield tinyio.isolate(outer()))
+
+    out, success = tinyio.Loop().run(main())
+    assert not success
+    assert str(out) == "outer"
+    assert inner_cancelled
+
+
+def test_isolate_propagates_base_exceptions():
+    def foo():
+        yield
+        raise AssertionError("Kaboom")
+
+    def bar():
+        yield tinyio.isolate(foo())
+
+    with pytest.raises(AssertionError, match="Kaboom"):
+        tinyio.Loop().run(bar())
+
+
+def test_isolate_boundary():
+    def child():
+        yield tinyio.sleep(0.05)
+
+    def foo(coro):
+        yield coro
+
+    def bar():
+        coro = child()
+        yield {coro}
+        yield tinyio.isolate(foo(coro))
+
+    with pytest.raises(tinyio.CancelledError, match="other side of a `tinyio.isolate` boundary"):
+        tinyio.Loop().run(bar())
+
+
+def test_isolate_max_active():
+    def child(i):
+        yield
+        if i == 3:
+            raise RuntimeError("Kaboom")
+        return i
+
+    def foo():
+        return (yield [child(i) for i in range(10)])
+
+    def bar():
+        out1, success1 = yield tinyio.isolate(foo())
+        out2, success2 = yield tinyio.isolate(tinyio.gather([child(i) for i in range(3)]))
+        return success1, type(out1), success2, out2
+
+    loop = tinyio.Loop(max_active=2)
+    assert loop.run(bar()) == (False, RuntimeError, True, [0, 1, 2])
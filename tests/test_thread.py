@@ -70,3 +70,54 @@ def test_simultaneous_errors():
     assert len(catcher.value.exceptions) > 1
     for e in catcher.value.exceptions:
         assert type(e) is RuntimeError
+
+
+def test_many_round_trips():
+    # Lots of quick thread -> loop handoffs, to exercise the races between the thread setting the wakeup and the loop
+    # going to sleep.
+    def _run():
+        for i in range(500):
+            out = yield tinyio.run_in_thread(lambda x: x + 1, i)
+            assert out == i + 1
+
+    loop = tinyio.Loop()
+    start = time.monotonic()
+    loop.run(_run())
+    assert time.monotonic() - start < 10
+
+
+def test_loops_in_threads():
+    # Several loops, each in their own thread, all waiting on one shared event, which is set from inside another loop.
+    shared = tinyio.Event()
+    outs = []
+
+    def _ping_pong(i):
+        ping = tinyio.Event()
+        pong = tinyio.Event()
+
+        def pinger():
+            for _ in range(200):
+                ping.set()
+                yield pong.wait()
+                pong.clear()
+
+        def ponger():
+            for _ in range(200):
+                yield ping.wait()
+                ping.clear()
+                pong.set()
+
+        yield [pinger(), ponger(), shared.wait()]
+        outs.append(i)
+
+    def _setter():
+        yield tinyio.sleep(0.05)
+        shared.set()
+
+    threads = [threading.Thread(target=tinyio.Loop().run, args=(_ping_pong(i),)) for i in range(8)]
+    for t in threads:
+        t.start()
+    tinyio.Loop().run(_setter())
+    for t in threads:
+        t.join(timeout=10)
+    assert sorted(outs) == list(range(8))
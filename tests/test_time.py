@@ -1,5 +1,6 @@
 import time
 
+import pytest
 import tinyio
 
 
@@ -22,6 +23,111 @@ def test_sleep():
     assert sum(outs) >= 4  # We allow one failure, to decrease flakiness.
 
 
+def test_sleep_until():
+    def f():
+        start = time.monotonic()
+        # Deadlines in the past just yield to the loop.
+        yield tinyio.sleep_until(start - 1)
+        assert time.monotonic() - start < 0.05
+        yield [tinyio.sleep_until(start + 0.05), tinyio.sleep_until(start + 0.1)]
+        return time.monotonic() - start
+
+    assert 0.1 <= tinyio.Loop().run(f()) < 0.5
+
+
+def test_sleep_cancelled():
+    def _fail():
+        yield tinyio.sleep(0.01)
+        raise RuntimeError("kaboom")
+
+    def _work():
+        yield [_fail(), tinyio.sleep(100)]
+
+    def _main():
+        start = time.monotonic()
+        out, success = yield tinyio.isolate(_work())
+        assert not success
+        assert type(out) is RuntimeError
+        assert time.monotonic() - start < 1
+        # The cancelled sleep left nothing behind in the loop's timers.
+        yield tinyio.sleep(0.01)
+
+    tinyio.Loop().run(_main())
+
+
+def test_interval():
+    def f():
+        start = time.monotonic()
+        missed = []
+        for i, tick in enumerate(tinyio.interval(0.02)):
+            missed.append((yield tick))
+            if i == 9:
+                break
+            # The time spent working between ticks doesn't push the next tick back.
+            time.sleep(0.005)
+        return time.monotonic() - start, missed
+
+    duration, missed = tinyio.Loop().run(f())
+    assert 0.2 <= duration < 0.24
+    assert missed == [0] * 10
+
+
+def test_interval_starts_on_call():
+    # The ticks are counted from when `tinyio.interval` is called, not from when it is first iterated over.
+    ticks = tinyio.interval(0.05)
+    start = time.monotonic()
+    time.sleep(0.03)
+
+    def f():
+        yield next(ticks)
+        return time.monotonic() - start
+
+    assert 0.04 < tinyio.Loop().run(f()) < 0.07
+
+
+def test_interval_missed():
+    def f():
+        ticks = tinyio.interval(0.05)
+        yield next(ticks)
+        start = time.monotonic()
+        time.sleep(0.125)
+        # We're between the second and third ticks from now: the next `yield` skips the first and gives the second
+        # straight away.
+        missed = yield next(ticks)
+        assert time.monotonic() - start < 0.14
+        missed2 = yield next(ticks)
+        assert 0.14 < time.monotonic() - start < 0.2
+        return missed, missed2
+
+    assert tinyio.Loop().run(f()) == (1, 0)
+
+
+def test_interval_invalid():
+    with pytest.raises(ValueError, match="positive"):
+        tinyio.interval(0)
+
+    def f():
+        ticks = tinyio.interval(0.01)
+        yield [next(ticks), next(ticks)]
+
+    with pytest.raises(RuntimeError, match="two ticks"):
+        tinyio.Loop().run(f())
+
+
+def test_interval_cancelled():
+    ticks = tinyio.interval(0.02)
+
+    def f():
+        out = yield tinyio.timeout(next(ticks), 0.005)
+        assert out == (None, False)
+        # The tick that was cancelled is still the next one to come.
+        return (yield next(ticks))
+
+    start = time.monotonic()
+    assert tinyio.Loop().run(f()) == 0
+    assert 0.015 < time.monotonic() - start < 0.04
+
+
 def _sleep(x):
     yield tinyio.sleep(x)
     return 3
@@ -39,3 +145,258 @@ def _test_timeout():
 def test_timeout():
     loop = tinyio.Loop()
     loop.run(_test_timeout())
+
+
+def test_timeout_cancels_subtree():
+    timed_out = []
+
+    def _forever(name):
+        try:
+            while True:
+                yield tinyio.sleep(0.01)
+        except tinyio.TimeoutError:
+            timed_out.append(name)
+            raise
+
+    def _work():
+        yield {_forever("background")}
+        yield [_forever("child1"), _forever("child2")]
+
+    def _main():
+        start = time.monotonic()
+        out = yield tinyio.timeout(_work(), 0.05)
+        assert time.monotonic() - start < 1
+        return out
+
+    assert tinyio.Loop().run(_main()) == (None, False)
+    assert set(timed_out) == {"background", "child1", "child2"}
+
+
+def test_timeout_cancels_threads():
+    cancelled = []
+
+    def _blocking():
+        try:
+            for _ in range(200):
+                time.sleep(0.01)
+        except tinyio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    def _main():
+        start = time.monotonic()
+        out = yield tinyio.timeout(tinyio.run_in_thread(_blocking), 0.05)
+        assert time.monotonic() - start < 1
+        return out
+
+    assert tinyio.Loop().run(_main()) == (None, False)
+    assert cancelled == [True]
+
+
+def test_timeout_leaves_background():
+    outs = []
+
+    def _background():
+        yield tinyio.sleep(0.1)
+        outs.append("background")
+
+    def _work():
+        yield {_background()}
+        return 3
+
+    def _main():
+        start = time.monotonic()
+        out = yield tinyio.timeout(_work(), 0.05)
+        # We don't wait for `_background`...
+        assert time.monotonic() - start < 0.05
+        outs.append("main")
+        # ...and it isn't cancelled when the timeout would have expired.
+        yield tinyio.sleep(0.2)
+        return out
+
+    assert tinyio.Loop().run(_main()) == (3, True)
+    assert outs == ["main", "background"]
+
+
+def test_timeout_background_keeps_timeout():
+    # A nested timeout left running in the background still expires, even though it is longer than the one it started
+    # in.
+    def _work(outs):
+        outs.append((yield tinyio.timeout(_sleep(1), 0.1)))
+
+    def _start(outs):
+        yield {_work(outs)}
+
+    def _main():
+        outs = []
+        start = time.monotonic()
+        yield tinyio.timeout(_start(outs), 0.05)
+        yield tinyio.sleep(0.2)
+        assert outs == [(None, False)]
+        assert time.monotonic() - start < 0.5
+
+    tinyio.Loop().run(_main())
+
+
+def test_timeout_background_in_isolate():
+    # Left-over background work joins the enclosing region, so `tinyio.isolate` waits for it.
+    outs = []
+
+    def _background():
+        yield tinyio.sleep(0.05)
+        outs.append("background")
+
+    def _work():
+        yield {_background()}
+
+    def _main():
+        yield tinyio.timeout(_work(), 1)
+        outs.append("main")
+
+    def _isolated():
+        out = yield tinyio.isolate(_main())
+        outs.append("isolate")
+        return out
+
+    assert tinyio.Loop().run(_isolated()) == (None, True)
+    assert outs == ["main", "background", "isolate"]
+
+
+def test_timeout_already_seen():
+    def _main():
+        task = _sleep(0.05)
+        yield {task}
+        # Already running: we just stop waiting on it, rather than cancelling it.
+        out = yield tinyio.timeout(task, 0.01)
+        assert out == (None, False)
+        out = yield tinyio.timeout(task, 1)
+        assert out == (3, True)
+        # Already finished.
+        out = yield tinyio.timeout(task, 1)
+        assert out == (3, True)
+
+    tinyio.Loop().run(_main())
+
+
+def test_timeout_expires_with_sleep():
+    # Some of these regions expire in the same batch of timers as the sleep inside them, with the region going first.
+    def _sleeper():
+        while True:
+            yield tinyio.sleep(0.001)
+
+    def _main():
+        outs = yield [tinyio.timeout(_sleeper(), 0.01) for _ in range(100)]
+        assert all(out == (None, False) for out in outs)
+
+    loop = tinyio.Loop()
+    for _ in range(20):
+        loop.run(_main())
+
+
+def test_timeout_nested():
+    def _inner(delay, timeout_in_seconds):
+        return (yield tinyio.timeout(_sleep(delay), timeout_in_seconds))
+
+    def _main():
+        # Inner expires first: the outer timeout carries on.
+        out1 = yield tinyio.timeout(_inner(0.2, 0.02), 1)
+        # Outer expires first: everything is cancelled.
+        start = time.monotonic()
+        out2 = yield tinyio.timeout(_inner(0.5, 10), 0.02)
+        assert time.monotonic() - start < 0.4
+        return out1, out2
+
+    assert tinyio.Loop().run(_main()) == (((None, False), True), (None, False))
+
+
+def test_timeout_error_propagates():
+    def _fail():
+        yield
+        raise RuntimeError("Kaboom")
+
+    def _main():
+        yield tinyio.timeout(_fail(), 1)
+
+    with pytest.raises(RuntimeError, match="Kaboom"):
+        tinyio.Loop().run(_main())
+
+    def _isolated():
+        return (yield tinyio.isolate(_main()))
+
+    out, success = tinyio.Loop().run(_isolated())
+    assert not success
+    assert str(out) == "Kaboom"
+
+
+def test_timeout_shared_coroutines():
+    def _main():
+        shared = _sleep(0.02)
+        yield {shared}
+
+        # Waiting on a coroutine from outside the timeout is fine...
+        def _uses_shared():
+            return (yield shared)
+
+        assert (yield tinyio.timeout(_uses_shared(), 1)) == (3, True)
+
+        # ...and so is the other way around.
+        inner = _sleep(0.02)
+
+        def _runs_inner():
+            yield {inner}
+            yield tinyio.sleep(0.01)
+
+        yield {tinyio.timeout(_runs_inner(), 1)}
+        yield
+        return (yield inner)
+
+    assert tinyio.Loop().run(_main()) == 3
+
+
+def test_timeout_spares_shared_coroutines():
+    cancelled = []
+
+    def _forever():
+        try:
+            yield tinyio.sleep(10)
+        except tinyio.TimeoutError:
+            cancelled.append("forever")
+            raise
+
+    def _add_one(x):
+        return (yield x) + 1
+
+    def _main():
+        inner = _sleep(0.1)
+        # `_add_one(inner)` is being waited on from outside the region, and in turn is waiting on `inner`.
+        outer = _add_one(inner)
+
+        def _runs_inner():
+            yield {outer, _forever()}
+            yield tinyio.sleep(10)
+
+        start = time.monotonic()
+        region = tinyio.timeout(_runs_inner(), 0.02)
+        yield {region}
+        # Give `_runs_inner` a chance to start `outer`.
+        yield tinyio.sleep(0.005)
+        out = yield [region, outer]
+        assert time.monotonic() - start < 1
+        return out
+
+    assert tinyio.Loop().run(_main()) == [(None, False), 4]
+    assert cancelled == ["forever"]
+
+
+def test_timeout_misbehaving():
+    def _ignores_timeout():
+        try:
+            yield tinyio.sleep(1)
+        except tinyio.TimeoutError:
+            pass
+
+    def _main():
+        return (yield tinyio.timeout(_ignores_timeout(), 0.01))
+
+    with pytest.warns(RuntimeWarning, match="tinyio.TimeoutError"):
+        assert tinyio.Loop().run(_main()) == (None, False)
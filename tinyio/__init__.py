@@ -1,9 +1,17 @@
-from ._background import as_completed as as_completed
+from ._background import Nursery as Nursery, as_completed as as_completed, gather as gather
 from ._core import (
+    Blocked as Blocked,
     CancelledError as CancelledError,
     Coro as Coro,
     Event as Event,
     Loop as Loop,
+    TimeoutError as TimeoutError,
+    checkpoint as checkpoint,
+    deadline as deadline,
+    isolate as isolate,
+    priority as priority,
+    reduce as reduce,
+    timeout as timeout,
 )
 from ._integrations import (
     from_asyncio as from_asyncio,
@@ -11,7 +19,7 @@ from ._integrations import (
     to_asyncio as to_asyncio,
     to_trio as to_trio,
 )
-from ._isolate import copy as copy, isolate as isolate
+from ._isolate import copy as copy
 from ._sync import Barrier as Barrier, Lock as Lock, Semaphore as Semaphore
 from ._thread import ThreadPool as ThreadPool, run_in_thread as run_in_thread
-from ._time import TimeoutError as TimeoutError, sleep as sleep, timeout as timeout
+from ._time import interval as interval, sleep as sleep, sleep_until as sleep_until
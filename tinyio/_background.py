@@ -1,5 +1,6 @@
-from collections.abc import Generator, Iterable
-from typing import TypeVar
+import itertools as it
+from collections.abc import Callable, Generator, Iterable
+from typing import Any, TypeVar
 
 from ._core import Coro, Event
 
@@ -48,6 +49,68 @@ def as_completed(coros: set[Coro[_T]]) -> Coro[Iterable[Coro[_T]]]:
     return as_completed_iterator(outs, events)
 
 
+def gather(coros: Iterable[Coro[_T] | Callable[[], Coro[_T]]], limit: None | int = None) -> Coro[list[_T]]:
+    """Runs multiple coroutines, returning a list of their outputs in input order.
+
+    Each element of `coros` may be either a coroutine, or a zero-argument function returning a coroutine.
+
+    With `limit=None` then this is just `yield [coro1, coro2, ...]`. With `limit=k` then at most `k` coroutines will be
+    running at a time, and `coros` is only pulled from when one of them finishes. In particular `coros` may be a lazy
+    iterator over a very large number of items, without every coroutine needing to be created up front.
+
+    Usage is as follows:
+    ```python
+    import tinyio
+
+    def fetch(row):
+        yield tinyio.sleep(0.1)
+        return row * 2
+
+    def gather_demo():
+        out = yield tinyio.gather((fetch(row) for row in range(100)), limit=10)
+        print(f"Gather demo: {out[:3]}")
+
+    loop = tinyio.Loop()
+    loop.run(gather_demo())
+    # Gather demo: [0, 2, 4]
+    ```
+    """
+    if limit is not None and limit < 1:
+        raise ValueError("`tinyio.gather(..., limit=...)` must be at least 1.")
+    return _gather(coros, limit)
+
+
+def _gather(coros: Iterable[Coro[_T] | Callable[[], Coro[_T]]], limit: None | int) -> Coro[list[_T]]:
+    if limit is None:
+        return (yield [_make_coro(coro) for coro in coros])
+
+    # All workers share the same iterator, so that an item is only pulled once some worker is free to run it. Each
+    # worker starts on one of the first `limit` items, so that we never start more workers than there are items.
+    iterator = enumerate(coros)
+    first = list(it.islice(iterator, limit))
+    outs: list[Any] = [None] * len(first)
+
+    def worker(i, coro):
+        outs[i] = yield _make_coro(coro)
+        for i, coro in iterator:
+            outs.append(None)
+            outs[i] = yield _make_coro(coro)
+
+    yield [worker(i, coro) for i, coro in first]
+    return outs
+
+
+def _make_coro(coro):
+    if not isinstance(coro, Generator):
+        if callable(coro):
+            coro = coro()
+        if not isinstance(coro, Generator):
+            raise ValueError(
+                "`tinyio.gather(coros=...)` must be an iterable of coroutines, or of functions returning coroutines."
+            )
+    return coro
+
+
 # We'd much rather implement this as just
 # ```python
 # def as_completed_iterator(outs, events):
@@ -86,3 +149,79 @@ _deprecated_0_4_0_msg = (
     "        out = yield out\n"
     "        ...\n"
 )
+
+
+class Nursery:
+    """A changing collection of background coroutines, which can be joined on all together or in part.
+
+    Usage is as follows:
+    ```python
+    import tinyio
+
+    def sleep(x):
+        yield tinyio.sleep(x)
+        return x
+
+    def nursery_demo():
+        nursery = tinyio.Nursery()
+        first = yield nursery.spawn(sleep(1))
+        for x in range(2, 5):
+            yield nursery.spawn(sleep(x))
+        out = yield nursery.join([first])
+        print(f"Nursery demo: {out}")
+        yield nursery.join()
+        print(f"Nursery demo: {len(nursery)}")
+
+    loop = tinyio.Loop()
+    loop.run(nursery_demo())
+    # Nursery demo: [1]
+    # Nursery demo: 0
+    ```
+    """
+
+    def __init__(self):
+        self._num_running = 0
+        self._done = Event()
+        self._done.set()
+
+    def __len__(self) -> int:
+        """The number of children that are still running."""
+        return self._num_running
+
+    def spawn(self, coro: Coro[_T]) -> Coro[Coro[_T]]:
+        """Schedules `coro` to run in the background, like `yield {coro}`, and adds it to this nursery.
+
+        Usage is `coro = yield nursery.spawn(coro)`. The returned coroutine can be passed to `nursery.join` to wait on
+        it specifically.
+        """
+        if not isinstance(coro, Generator):
+            raise ValueError("`Nursery.spawn(coro=...)` must be a coroutine.")
+        return self._spawn(coro)
+
+    def _spawn(self, coro: Coro[_T]) -> Coro[Coro[_T]]:
+        self._num_running += 1
+        if self._num_running == 1:
+            self._done.clear()
+        yield {self._wrapper(coro)}
+        return coro
+
+    def join(self, coros: None | Iterable[Coro[_T]] = None) -> Coro[None | list[_T]]:
+        """Waits on children of this nursery.
+
+        - `yield nursery.join()` waits until every child has finished, including any that are spawned whilst waiting.
+        - `out = yield nursery.join([coro1, coro2, ...])` waits on just those children, and returns their outputs.
+        """
+        if coros is None:
+            yield self._done.wait()
+            return None
+        else:
+            return (yield list(coros))
+
+    def _wrapper(self, coro):
+        try:
+            yield coro
+        finally:
+            # Including if we're cancelled, e.g. by a `tinyio.timeout`, so that `self.join()` doesn't wait forever.
+            self._num_running -= 1
+            if self._num_running == 0:
+                self._done.set()
@@ -2,19 +2,20 @@ import collections as co
 import contextlib
 import dataclasses
 import enum
-import graphlib
 import heapq
 import inspect
+import itertools as it
+import math
 import threading
 import time
 import traceback
 import types
 import warnings
 import weakref
-from collections.abc import Callable, Generator
-from typing import Any, NoReturn, TypeAlias, TypeVar
+from collections.abc import Callable, Generator, Iterable
+from typing import Any, Literal, NoReturn, Protocol, TypeAlias, TypeVar, cast, final
 
-from ._utils import EventWithFileno, SimpleContextManager, filter_traceback
+from ._utils import EventWithFileno, SimpleContextManager, Wakeup, check_wakeup, filter_traceback
 
 
 #
@@ -25,24 +26,94 @@ from ._utils import EventWithFileno, SimpleContextManager, filter_traceback
 # coroutine back on the loop.
 # Counters can be decremented in three ways: another coroutine finishes, an `Event.set()` is triggered, or a timeout in
 # `Event.wait(timeout=...)` is triggered.
+# Each coroutine that is live in the loop has a `_CoroState`, recording who is waiting on it. When it finishes, its
+# result is handed directly to each of them, and is recorded in `Loop._results` for anyone who asks for it later.
 #
 
 
 _Return = TypeVar("_Return")
+_T = TypeVar("_T")
 Coro: TypeAlias = Generator[Any, Any, _Return]
+Lane: TypeAlias = Literal["high", "normal", "low", "idle"]
+Scheduling: TypeAlias = Literal["fifo", "deadline"]
+
+# How many waits on already-running coroutines we let build up before checking them for cycles, if the loop doesn't go
+# idle first.
+_MAX_NEW_EDGES = 1024
 
 
 class Loop:
     """Event loop for running `tinyio`-style coroutines."""
 
-    def __init__(self):
+    def __init__(
+        self,
+        wakeup: None | Wakeup = None,
+        scheduling: Scheduling = "fifo",
+        time_slice: None | int | float = None,
+        max_active: None | int = None,
+        max_results: None | int = None,
+        timer_slack: int | float = 0,
+        max_spin: int | float = 0,
+    ):
+        """**Arguments:**
+
+        - `wakeup`: how the loop is woken up from another thread whilst it is blocked waiting. One of `"eventfd"`
+            (Linux only), `"pipe"` (POSIX only) or `"socketpair"`. Defaults to the first of these that is available.
+        - `scheduling`: the order in which to run coroutines that are ready at the same time, within each priority lane
+            (see `tinyio.priority`). Either `"fifo"` for first-in-first-out, or `"deadline"` to run the coroutine with
+            the earliest deadline first (see `tinyio.deadline`). Coroutines without a deadline run after those with
+            one, in first-in-first-out order.
+        - `time_slice`: if set, the number of seconds a coroutine may run for before `tinyio.checkpoint()` will
+            suspend it. This also turns on accounting of how long each coroutine has been running for, see
+            `Loop.time_used`. If `None` then `tinyio.checkpoint()` always suspends, just like a bare `yield`.
+        - `max_active`: if set, the maximum number of coroutines that may have been started but not yet finished. Any
+            further coroutines that are yielded are held back, unstarted, until others finish. So that this can never
+            deadlock, a coroutine waiting on other coroutines always has at least one of them started, which means that
+            deeply nested waits may briefly exceed this limit. Note that coroutines waiting on an `Event` still count
+            towards the limit, so avoid waiting on an event that will only be set by a coroutine that hasn't started.
+        - `max_results`: if set, the maximum number of results of finished coroutines to keep around, discarding the
+            least-recently-used first. (By default, results are kept for as long as their coroutine is referenced
+            anywhere, so that it can be `yield`ed on again to retrieve its result.) If `0` then a result is only ever
+            handed to the coroutines that were already waiting on it.
+        - `timer_slack`: the number of seconds that a timer (from `tinyio.sleep`, `Event.wait(timeout_in_seconds=...)`,
+            `tinyio.timeout`, etc.) may fire late by. When the loop is blocked waiting for its next timer, it will sleep
+            for this much longer, so that every other timer expiring in that window fires in the same wakeup. Raising
+            this trades timer precision for fewer wakeups in timer-heavy programs.
+        - `max_spin`: if positive, then whenever the loop is blocked, it first polls (releasing the GIL in between) for
+            up to this many seconds before going to sleep in the kernel. This makes handoffs from threads (e.g. from
+            `tinyio.run_in_thread`) faster, as well as making very short `tinyio.sleep`s more precise, at the cost of
+            using more CPU whilst idle. The polling window is tuned as the loop runs: it shrinks when polling doesn't
+            pay off, and grows back (up to `max_spin`) when the loop is being woken up quickly.
+        """
+        if scheduling not in ("fifo", "deadline"):
+            raise ValueError(f"Invalid `scheduling={scheduling!r}`, which should be either 'fifo' or 'deadline'.")
+        if time_slice is not None and time_slice < 0:
+            raise ValueError("`time_slice` must be non-negative.")
+        if max_active is not None and max_active < 1:
+            raise ValueError("`max_active` must be at least 1.")
+        if max_results is not None and max_results < 0:
+            raise ValueError("`max_results` must be non-negative.")
+        if timer_slack < 0:
+            raise ValueError("`timer_slack` must be non-negative.")
+        if max_spin < 0:
+            raise ValueError("`max_spin` must be non-negative.")
         # Keep around the results with weakrefs.
         # This makes it possible to perform multiple `.run`s, with coroutines that may internally await on the same
         # coroutines as each other.
         # It's a weakref as if no-one else has access to them then they cannot appear in our event loop, so we don't
         # need to keep their results around for the above use-case.
-        self._results = weakref.WeakKeyDictionary()
+        if max_results is None:
+            self._results = weakref.WeakKeyDictionary()
+        else:
+            self._results = _LRUWeakKeyDictionary(max_results)
         self._running = False
+        self._wakeup: Wakeup = check_wakeup(wakeup)
+        self._scheduling: Scheduling = scheduling
+        self._time_slice = time_slice
+        self._max_active = max_active
+        self._timer_slack = timer_slack
+        self._max_spin = max_spin
+        self._waiting_on: dict[Coro, _CoroState] = {}
 
     def run(self, coro: Coro[_Return], exception_group: None | bool = None) -> _Return:
         """Run the specified coroutine in the event loop.
@@ -67,7 +138,8 @@ class Loop:
         """
         __tracebackhide__ = True
         try:
-            with self.runtime(coro, exception_group) as gen:
+            # We never need to cede control to anything else, so only come back out of the loop when it is blocked.
+            with self.runtime(coro, exception_group, max_steps=None) as gen:
                 while True:
                     try:
                         wait = next(gen)
@@ -80,18 +152,44 @@ class Loop:
             raise
 
     def runtime(
-        self, coro: Coro[_Return], exception_group: None | bool
-    ) -> contextlib.AbstractContextManager[Generator[None | Callable[[], None], None, _Return]]:
+        self,
+        coro: Coro[_Return],
+        exception_group: None | bool,
+        max_steps: None | int = 1,
+        max_time: None | int | float = None,
+    ) -> contextlib.AbstractContextManager[Generator["None | Blocked", None, _Return]]:
         """The generator for driving the event loop. This is low-level functionality that makes it possible to iterate
         the loop by just a single step at a time. This is typically useful for integrating with another event loop.
 
         See the source code for `tinyio.Loop.run`, or `tinyio.to_asyncio`, for an example of how to iterate through this
         until completion.
 
-        Yields `None` after each step to cede control, or a callable indicating the loop is blocked waiting for an event
-        or timeout.
+        Yields `None` to cede control, or a `tinyio.Blocked` indicating the loop is blocked waiting for an event or
+        timeout. Calling it blocks until the loop can make progress again. Alternatively, to wait alongside other things
+        in some other event loop, this has:
+
+        - a `.fileno()` method, returning a file descriptor that becomes readable once the loop can make progress;
+        - a `.deadline` attribute, which is either `None` or the time (as per `time.monotonic()`) at which the loop
+            should be woken up regardless;
+        - a context manager, which must be held whilst waiting on the file descriptor. This returns whether the loop has
+            already been woken up, in which case there is no need to wait at all.
+
+        For example:
+        ```python
+        with wait as woken:
+            if not woken:
+                ...  # Wait for `wait.fileno()` to be readable, or for `wait.deadline` to pass.
+        ```
+
+        By default `None` is yielded after every step. This can be batched up by passing `max_steps` and/or `max_time`:
+        `None` will then be yielded once either `max_steps` coroutines have been stepped, or `max_time` seconds have
+        passed, since the last yield. Either may be `None` to disable that limit.
         """
         __tracebackhide__ = True
+        if max_steps is not None and max_steps < 1:
+            raise ValueError("`max_steps` must be at least 1.")
+        if max_time is not None and max_time < 0:
+            raise ValueError("`max_time` must be non-negative.")
         if self._running:
             raise RuntimeError("Cannot call `tinyio.Loop().run` whilst the loop is currently running.")
         if not isinstance(coro, Generator):
@@ -113,19 +211,24 @@ class Loop:
         if inspect.getgeneratorstate(coro) != inspect.GEN_CREATED:
             raise ValueError(f"Invalid input {coro}, which is a generator that has already started.")
         self._running = True
-        wake_loop = EventWithFileno()
+        wake_loop = EventWithFileno(self._wakeup, self._max_spin)
         wake_loop.set()
-        waiting_on = dict[Coro, list[_WaitingFor]]()
-        waiting_on[coro] = []
+        ready = _ReadyQueue(self._scheduling)
+        waiting_on = dict[Coro, _CoroState]()
+        waiting_on[coro] = _CoroState(coro, ready.normal, math.inf, [], None)
+        self._waiting_on = waiting_on
+        new_edges = list[tuple[Coro, Coro]]()
         current_coro_ref = [coro]
 
-        enter = self._runtime(coro, waiting_on, current_coro_ref, wake_loop)
+        enter = self._runtime(coro, ready, waiting_on, new_edges, current_coro_ref, wake_loop, max_steps, max_time)
 
         def exit(e: None | BaseException):
             __tracebackhide__ = True
             wake_loop.close()
             assert self._running
             self._running = False
+            # Don't keep this run's coroutines alive (e.g. those cancelled by an error) for as long as the loop exists.
+            self._waiting_on = {}
             if e is None:
                 del __tracebackhide__
                 if len(waiting_on) != 0 or inspect.getgeneratorstate(enter) != inspect.GEN_CLOSED:
@@ -150,101 +253,242 @@ class Loop:
 
         return SimpleContextManager(enter, exit)
 
+    def time_used(self, coro: Coro) -> float:
+        """The number of seconds that `coro` has spent running so far, for a coroutine that is currently in this loop.
+
+        This is only tracked if the loop has a `time_slice`, and is zero otherwise.
+        """
+        try:
+            state = self._waiting_on[coro]
+        except KeyError:
+            raise ValueError(f"{coro} is not currently running in this loop.") from None
+        return state.time_used
+
     def _runtime(
         self,
         coro: Coro[_Return],
-        waiting_on: dict[Coro, list["_WaitingFor"]],
+        ready: "_ReadyQueue",
+        waiting_on: dict[Coro, "_CoroState"],
+        new_edges: list[tuple[Coro, Coro]],
         current_coro_ref: list[Coro],
         wake_loop: EventWithFileno,
-    ) -> Generator[None | Callable[[], None], None, _Return]:
+        max_steps: None | int,
+        max_time: None | int | float,
+    ) -> Generator["None | Blocked", None, _Return]:
         __tracebackhide__ = True
-        queue: co.deque[_Todo] = co.deque()
-        queue.appendleft(_Todo(coro, None))
-        # Loop invariant: `{x.coro for x in queue}.issubset(set(waiting_on.keys()))`
-        wait_heap: list[_Wait] = []
-        while True:
-            if len(queue) == 0:
-                if len(waiting_on) == 0:
-                    # We're done.
-                    break
+        num_steps = 0
+        end_time = math.inf if max_time is None else time.perf_counter() + max_time
+        root_state = waiting_on[coro]
+        ready.normal.appendleft((root_state, None))
+        time_slice = self._time_slice
+        timers = _TimerWheel(slack=self._timer_slack)
+        run = _RunState(
+            ready, waiting_on, wake_loop, threading.Lock(), co.deque(), timers, time_slice, self._max_active
+        )
+        high = ready.high
+        normal = ready.normal
+        low = ready.low
+        # Make `run` available to `tinyio.checkpoint()` whilst we're stepping coroutines. As we may be interleaved with
+        # other loops in this thread, put back whatever was there before whenever we cede control.
+        previous_run = getattr(_current, "run", None)
+        _current.run = run
+        try:
+            # Loop invariant: `{x.coro for x, _ in ready}.issubset(set(waiting_on.keys()))`
+            while True:
+                self._clear(run)
+                if normal and not high and not low:
+                    # Inlined fast path for `ready.pop()`.
+                    todo = normal.pop()
                 else:
-                    # We might have a cycle bug...
-                    self._check_cycle(waiting_on, coro)
-                    # ...but hopefully we're just waiting on a thread or exogeneous event to unblock one of our
-                    # coroutines.
-                    while len(queue) == 0:
-                        timeout = None
-                        while len(wait_heap) > 0:
-                            soonest = wait_heap[0]
-                            assert soonest.timeout_in_seconds is not None
-                            if soonest.state == _WaitState.DONE:
-                                heapq.heappop(wait_heap)
-                            else:
-                                timeout = soonest.timeout_in_seconds - time.monotonic()
-                                break
-
-                        def wait():
-                            wake_loop.wait(timeout=timeout)
-
-                        yield wait
-                        self._clear(wait_heap, wake_loop)
-                        # These lines needs to be wrapped in a `len(queue)` check, as just because we've unblocked
-                        # doesn't necessarily mean that we're ready to schedule a coroutine: we could have something
-                        # like `yield [event1.wait(...), event2.wait(...)]`, and only one of the two has unblocked.
-            else:
-                self._clear(wait_heap, wake_loop)
-            todo = queue.pop()
-            current_coro_ref[0] = todo.coro
-            self._step(todo, queue, waiting_on, wait_heap, wake_loop)
-            yield
-        return self._results[coro]
+                    todo = ready.pop()
+                if todo is None:
+                    if len(waiting_on) == 0:
+                        # We're done.
+                        break
+                    else:
+                        # We might have a cycle bug...
+                        self._check_cycle(waiting_on, new_edges, coro)
+                        # ...but hopefully we're just waiting on a thread or exogeneous event to unblock one of our
+                        # coroutines.
+                        while todo is None:
+                            now = time.monotonic()
+                            timeout = run.timers.next_timeout(now)
+                            _current.run = previous_run
+                            yield _Blocked(wake_loop, None if timeout is None else now + timeout)
+                            _current.run = run
+                            num_steps = 0
+                            if max_time is not None:
+                                end_time = time.perf_counter() + max_time
+                            self._clear(run)
+                            todo = ready.pop()
+                            # These lines needs to be in a loop, as just because we've unblocked doesn't necessarily
+                            # mean that we're ready to schedule a coroutine: we could have something like
+                            # `yield [event1.wait(...), event2.wait(...)]`, and only one of the two has unblocked.
+                current_coro_ref[0] = todo[0].coro
+                try:
+                    if time_slice is None:
+                        self._step(todo, run, waiting_on, new_edges)
+                    else:
+                        step_start = run.step_start = time.perf_counter()
+                        self._step(todo, run, waiting_on, new_edges)
+                        todo[0].time_used += time.perf_counter() - step_start
+                except BaseException as e:
+                    # Only crash the `tinyio.isolate` region that this coroutine is in, not the whole loop.
+                    scope = _isolation(todo[0].scope)
+                    if scope is None:
+                        raise
+                    _fail_scope(e, scope, todo[0].coro, run, waiting_on)
+                if len(new_edges) > _MAX_NEW_EDGES:
+                    # A loop that never goes idle would otherwise accumulate these (and the coroutines in them) forever.
+                    self._check_cycle(waiting_on, new_edges, coro)
+                num_steps += 1
+                if (max_steps is not None and num_steps >= max_steps) or (
+                    max_time is not None and time.perf_counter() >= end_time
+                ):
+                    _current.run = previous_run
+                    yield
+                    _current.run = run
+                    num_steps = 0
+                    if max_time is not None:
+                        end_time = time.perf_counter() + max_time
+        finally:
+            _current.run = previous_run
+        # Not `self._results[coro]`, which may have been discarded as per `max_results`.
+        return root_state.result
 
     @staticmethod
-    def _check_cycle(waiting_on, coro):
+    def _check_cycle(waiting_on, new_edges, coro):
         __tracebackhide__ = True
-        sorter = graphlib.TopologicalSorter()
-        for k, v in waiting_on.items():
-            for vi in v:
-                sorter.add(k, vi.coro)
-        try:
-            sorter.prepare()
-        except graphlib.CycleError:
-            should_raise = True
-        else:
-            should_raise = False
+        # Rather than topologically sorting the whole of `waiting_on` (which is O(number of coroutines), every time we
+        # go idle), we note that a cycle can only be closed by a coroutine waiting on another coroutine that was already
+        # running. `_step` records each such `(waiter, waitee)` edge in `new_edges`, and so here we only need to check
+        # whether any of them can reach back around to themselves.
+        # Each check walks up from `waiter` through everyone waiting on it, looking for `waitee`. That's just the
+        # coroutines 'above' the new edge, which is usually only a handful.
+        should_raise = False
+        for waiter, waitee in new_edges:
+            if waitee not in waiting_on.keys():
+                # `waitee` has since finished, so this edge no longer exists.
+                continue
+            seen = {waiter}
+            stack = [waiter]
+            while len(stack) > 0 and not should_raise:
+                coro_i = stack.pop()
+                if coro_i is waitee:
+                    should_raise = True
+                else:
+                    state = waiting_on.get(coro_i)
+                    if state is None:
+                        continue
+                    for upstream in state.waiters:
+                        upstream_coro = (upstream[0] if upstream[1] is None else upstream[0].state).coro
+                        if upstream_coro not in seen:
+                            seen.add(upstream_coro)
+                            stack.append(upstream_coro)
+            if should_raise:
+                break
+        new_edges.clear()
         if should_raise:
             _throw(coro, "Cycle detected in `tinyio` loop. Cancelling all coroutines.")
 
     @staticmethod
-    def _clear(wait_heap: list["_Wait"], wake_loop: EventWithFileno):
-        wake_loop.clear()
-        while len(wait_heap) > 0:
-            soonest = wait_heap[0]
-            assert soonest.timeout_in_seconds is not None
-            if soonest.state == _WaitState.DONE:
-                heapq.heappop(wait_heap)
-            elif soonest.timeout_in_seconds <= time.monotonic():
-                heapq.heappop(wait_heap)
-                soonest.notify_from_timeout()
-            else:
-                break
+    def _clear(run: "_RunState"):
+        run.wake_loop.clear()
+        while len(run.cleanups) > 0:
+            wait = run.cleanups.pop()
+            wait.cleanup()
+            if wait.timeout_in_seconds is not None:
+                run.timers.remove(wait)
+        if len(run.timers) > 0:
+            for timer in run.timers.pop_expired(time.monotonic()):
+                timer.notify_from_timeout()
 
     def _step(
         self,
         todo: "_Todo",
-        queue: co.deque["_Todo"],
-        waiting_on: dict[Coro, list["_WaitingFor"]],
-        wait_heap: list["_Wait"],
-        wake_loop: EventWithFileno,
+        run: "_RunState",
+        waiting_on: dict[Coro, "_CoroState"],
+        new_edges: list[tuple[Coro, Coro]],
     ) -> None:
         __tracebackhide__ = True
+        todo_state, todo_value = todo
+        todo_coro = todo_state.coro
+        # New coroutines inherit the lane of whoever yielded them.
+        queue = todo_state.ready
         try:
-            out = todo.coro.send(todo.value)
+            out = todo_coro.send(todo_value)
         except StopIteration as e:
-            assert todo.coro not in self._results.keys()
-            self._results[todo.coro] = e.value
-            for waiting_for in waiting_on.pop(todo.coro):
-                waiting_for.decrement()
+            if todo_coro is _cancelled:
+                # A stale entry in the ready queue, for a coroutine that has since been cancelled by `tinyio.isolate`.
+                return
+            assert todo_coro not in self._results
+            self._results[todo_coro] = todo_state.result = e.value
+            del waiting_on[todo_coro]
+            if run.num_pending > 0:
+                _start_pending(run, waiting_on)
+            for waiter in todo_state.waiters:
+                if waiter[1] is None:
+                    waiter[0].ready.appendleft((waiter[0], e.value))
+                else:
+                    waiter[0].deliver(waiter[1], e.value)
+            scope = todo_state.scope
+            if scope is not None:
+                del scope.members[todo_coro]
+                if not scope.isolating and scope.root is todo_state:
+                    # A `tinyio.timeout` is done as soon as its coroutine returns. Anything that it left running in the
+                    # background carries on, as part of the enclosing region.
+                    _release_scope(scope)
+                    _finish_scope(scope, (e.value, True))
+                elif len(scope.members) == 0:
+                    # Any nested regions have finished too, as each has a coroutine in `scope` waiting on it.
+                    _finish_scope(scope, (scope.root.result, True))  # pyright: ignore[reportOptionalMemberAccess]
+            return
+        # Fast paths for the most common kinds of `yield`. These must behave identically to the general case below.
+        if out is None:
+            queue.appendleft((todo_state, None))
+        elif type(out) is types.GeneratorType or type(out) is _Schedule:
+            # Waiting on a single coroutine: rather than a `_WaitingFor`, just resume `todo_coro` directly once `out`
+            # finishes.
+            deadline = todo_state.deadline
+            if type(out) is _Schedule:
+                # Only used if `out.coro` is new. Otherwise it has already been scheduled.
+                if out.lane is not None:
+                    queue = getattr(run.ready, out.lane)
+                if out.deadline is not None:
+                    deadline = min(deadline, out.deadline)
+                out = out.coro
+            state = waiting_on.get(out)
+            if state is not None:
+                if state.scope is not todo_state.scope and not _can_wait(todo_state.scope, state.scope):
+                    _wrong_scope(todo_coro, out)
+                state.waiters.append((todo_state, None))
+                new_edges.append((todo_coro, out))
+                if not state.admitted:
+                    # We're waiting on just this coroutine, so it needs to start, regardless of `max_active`.
+                    _admit(run, state)
+            elif _is_created(out):
+                scope = todo_state.scope
+                state = waiting_on[out] = _CoroState(out, queue, deadline, [(todo_state, None)], scope)
+                if scope is not None:
+                    scope.members[out] = state
+                queue.appendleft((state, None))
+            else:
+                try:
+                    result = self._results[out]
+                except KeyError:
+                    _check_not_started(todo_coro, out)
+                else:
+                    todo_state.ready.appendleft((todo_state, result))
+        elif type(out) is _Wait:
+            todo_state.waiting_for = waiting_for = _WaitingFor(1, todo_state, out, run)
+            out.register(waiting_for)
+            if out.timeout_in_seconds is not None:
+                run.timers.add(out)
+        elif type(out) is _Sleep:
+            # Straight onto the timer wheel: no `Event`, `_Wait` or `_WaitingFor` needed.
+            out.state = todo_state
+            todo_state.waiting_for = out
+            run.timers.add(out)
         else:
             original_out = out
             if type(out) is list and len(out) == 0:
@@ -254,38 +498,138 @@ class Loop:
             match out:
                 case None:
                     # original_out will either be `None` or `[]`.
-                    queue.appendleft(_Todo(todo.coro, original_out))
+                    queue.appendleft((todo_state, original_out))
                 case set():
                     for out_i in out:
                         if isinstance(out_i, Generator):
-                            if out_i not in self._results.keys() and out_i not in waiting_on.keys():
-                                _check_not_started(todo.coro, out_i)
-                                queue.appendleft(_Todo(out_i, None))
-                                waiting_on[out_i] = []
+                            if out_i not in waiting_on and (_is_created(out_i) or out_i not in self._results):
+                                _check_not_started(todo_coro, out_i)
+                                scope = todo_state.scope
+                                state = waiting_on[out_i] = _CoroState(out_i, queue, todo_state.deadline, [], scope)
+                                if scope is not None:
+                                    scope.members[out_i] = state
+                                if run.max_active is None:
+                                    queue.appendleft((state, None))
+                                else:
+                                    _start(run, waiting_on, state, force=False)
                         else:
                             assert not isinstance(out_i, _Wait)
-                            _invalid(todo.coro, original_out)
-                    queue.appendleft(_Todo(todo.coro, None))
+                            _invalid(todo_coro, original_out)
+                    queue.appendleft((todo_state, None))
                 case list():
-                    waiting_for = _WaitingFor(len(out), todo.coro, original_out, wake_loop, self._results, queue)
-                    for out_i in out:
+                    waiting_for = _WaitingFor(len(out), todo_state, original_out, run)
+                    # With `max_active`, always start at least one of the coroutines we're waiting on, so that we
+                    # can't deadlock.
+                    needs_start = True
+                    for index, out_i in enumerate(out):
                         if isinstance(out_i, Generator):
-                            if out_i in self._results.keys():
-                                waiting_for.decrement()
-                            elif out_i in waiting_on.keys():
-                                waiting_on[out_i].append(waiting_for)
+                            # One lookup per coroutine in the common cases: it's either live in the loop, or brand new.
+                            state = waiting_on.get(out_i)
+                            if state is not None:
+                                if state.scope is not todo_state.scope and not _can_wait(todo_state.scope, state.scope):
+                                    _wrong_scope(todo_coro, out_i)
+                                state.waiters.append((waiting_for, index))
+                                new_edges.append((todo_coro, out_i))
+                                if needs_start and not state.admitted:
+                                    _admit(run, state)
+                                needs_start = False
+                            elif _is_created(out_i):
+                                waiters: list[_Waiter] = [(waiting_for, index)]
+                                scope = todo_state.scope
+                                state = _CoroState(out_i, queue, todo_state.deadline, waiters, scope)
+                                waiting_on[out_i] = state
+                                if scope is not None:
+                                    scope.members[out_i] = state
+                                if run.max_active is None:
+                                    queue.appendleft((state, None))
+                                else:
+                                    _start(run, waiting_on, state, force=needs_start)
+                                needs_start = False
                             else:
-                                _check_not_started(todo.coro, out_i)
-                                queue.appendleft(_Todo(out_i, None))
-                                waiting_on[out_i] = [waiting_for]
+                                # Either finished, or started somewhere other than this loop.
+                                try:
+                                    result = self._results[out_i]
+                                except KeyError:
+                                    _check_not_started(todo_coro, out_i)
+                                else:
+                                    waiting_for.deliver(index, result)
                         elif isinstance(out_i, _Wait):
+                            todo_state.waiting_for = waiting_for
                             out_i.register(waiting_for)
                             if out_i.timeout_in_seconds is not None:
-                                heapq.heappush(wait_heap, out_i)
+                                run.timers.add(out_i)
                         else:
-                            _invalid(todo.coro, original_out)
+                            _invalid(todo_coro, original_out)
+                case _Reduce():
+                    # As the `list` case, except that the results are folded into `reducer` as they arrive. We start
+                    # `reducer.counter` at one, so it can't hit zero until we've finished iterating.
+                    reducer = _Reducer(1, todo_state, out.fn, out.initial)
+                    needs_start = True
+                    for out_i in out.coros:
+                        if not isinstance(out_i, Generator):
+                            _invalid(todo_coro, original_out)
+                        reducer.counter += 1
+                        state = waiting_on.get(out_i)
+                        if state is not None:
+                            if state.scope is not todo_state.scope and not _can_wait(todo_state.scope, state.scope):
+                                _wrong_scope(todo_coro, out_i)
+                            state.waiters.append((reducer, 0))
+                            new_edges.append((todo_coro, out_i))
+                            if needs_start and not state.admitted:
+                                _admit(run, state)
+                            needs_start = False
+                        elif _is_created(out_i):
+                            waiters: list[_Waiter] = [(reducer, 0)]
+                            scope = todo_state.scope
+                            state = waiting_on[out_i] = _CoroState(out_i, queue, todo_state.deadline, waiters, scope)
+                            if scope is not None:
+                                scope.members[out_i] = state
+                            if run.max_active is None:
+                                queue.appendleft((state, None))
+                            else:
+                                _start(run, waiting_on, state, force=needs_start)
+                            needs_start = False
+                        else:
+                            try:
+                                result = self._results[out_i]
+                            except KeyError:
+                                _check_not_started(todo_coro, out_i)
+                            else:
+                                reducer.deliver(0, result)
+                    reducer.decrement()
+                case _Isolate():
+                    coro = out.coro
+                    if not isinstance(coro, Generator) or coro in waiting_on or not _is_created(coro):
+                        # As `tinyio.Loop().run(coro)` would raise, were this a separate loop.
+                        error = ValueError(f"Invalid input {coro}, which is not a coroutine that has not yet started.")
+                        queue.appendleft((todo_state, (error, False)))
+                    else:
+                        scope = _Scope(todo_state, run, True, out.exception_group)
+                        state = _new_scope(scope, coro, queue, todo_state.deadline, waiting_on)
+                        # Take the first step straight away, so that `coro` has always started by the time anything
+                        # else gets to run.
+                        try:
+                            self._step((state, None), run, waiting_on, new_edges)
+                        except BaseException as e:
+                            _fail_scope(e, scope, coro, run, waiting_on)
+                case _Timeout():
+                    coro = out.coro
+                    if coro in waiting_on or not _is_created(coro):
+                        # Not ours to cancel. `_timeout` handles this case itself.
+                        queue.appendleft((todo_state, None))
+                        return
+                    expires = time.monotonic() + out.timeout_in_seconds
+                    scope = _Scope(todo_state, run, False, None, timeout_in_seconds=expires)
+                    state = _new_scope(scope, coro, queue, min(todo_state.deadline, expires), waiting_on)
+                    # Armed even if an enclosing region expires first: this region may outlive that one, if it is still
+                    # running in the background once the enclosing region's coroutine returns.
+                    run.timers.add(scope)
+                    if run.max_active is None:
+                        queue.appendleft((state, None))
+                    else:
+                        _start(run, waiting_on, state, force=True)
                 case _:
-                    _invalid(todo.coro, original_out)
+                    _invalid(todo_coro, original_out)
 
 
 class CancelledError(BaseException):
@@ -295,15 +639,428 @@ class CancelledError(BaseException):
 CancelledError.__module__ = "tinyio"
 
 
+class TimeoutError(BaseException):
+    """Raised when a `tinyio` coroutine is cancelled due to a `tinyio.timeout` expiring."""
+
+
+TimeoutError.__module__ = "tinyio"
+
+
+def priority(coro: Coro[_Return], lane: Lane) -> Coro[_Return]:
+    """Runs a coroutine in a particular priority lane.
+
+    Whenever several coroutines are ready to run, those in higher lanes go first: `"high"`, then `"normal"`, then
+    `"low"`. So that no lane is starved, a lane that has been passed over many times in a row still gets to run a step.
+    Coroutines in the `"idle"` lane only ever run when nothing else is ready.
+
+    Coroutines start in the `"normal"` lane, and any coroutines that they yield inherit their lane. For example:
+    ```python
+    def handle_request(request):
+        # `handle_request` and everything it yields runs ahead of `batch_job`.
+        ...
+
+    def main():
+        yield {tinyio.priority(batch_job(), "low")}
+        yield tinyio.priority(handle_request(request), "high")
+    ```
+
+    **Arguments:**
+
+    - `coro`: a coroutine. If this has already been seen by the loop then it keeps the lane it already has.
+    - `lane`: one of `"high"`, `"normal"`, `"low"`, or `"idle"`.
+
+    **Returns:**
+
+    A coroutine that can be `yield`ed on, returning the output of `coro`.
+    """
+    if not isinstance(coro, Generator):
+        raise ValueError(f"Invalid input {coro}, which is not a coroutine (a function using `yield` statements).")
+    if lane not in _lanes:
+        raise ValueError(f"Invalid `lane={lane!r}`, which should be one of {_lanes}.")
+    return _priority(coro, lane)
+
+
+def _priority(coro: Coro[_Return], lane: Lane) -> Coro[_Return]:
+    return (yield _Schedule(coro, lane, None))
+
+
+def deadline(coro: Coro[_Return], deadline: int | float) -> Coro[_Return]:
+    """Gives a coroutine a deadline, by which it should finish.
+
+    When running in a `tinyio.Loop(scheduling="deadline")`, then whenever several coroutines are ready to run, the one
+    with the earliest deadline goes first. For example, this can be used to attach a service-level agreement to each
+    incoming request. (When running in a `tinyio.Loop(scheduling="fifo")` then deadlines are tracked, but ignored.)
+
+    Any coroutines that `coro` goes on to yield inherit its deadline. A deadline can only ever be brought forward: if
+    the current coroutine already has an earlier deadline then `coro` will inherit that instead. `tinyio.timeout` also
+    sets a deadline for the coroutine it runs.
+
+    Nothing happens when a deadline is missed; for that, see `tinyio.timeout`.
+
+    **Arguments:**
+
+    - `coro`: a coroutine. If this has already been seen by the loop then it keeps the deadline it already has.
+    - `deadline`: the deadline, as an absolute time in seconds as measured by `time.monotonic()`.
+
+    **Returns:**
+
+    A coroutine that can be `yield`ed on, returning the output of `coro`.
+    """
+    if not isinstance(coro, Generator):
+        raise ValueError(f"Invalid input {coro}, which is not a coroutine (a function using `yield` statements).")
+    return _deadline(coro, deadline)
+
+
+def _deadline(coro: Coro[_Return], deadline: int | float) -> Coro[_Return]:
+    return (yield _Schedule(coro, None, deadline))
+
+
+def reduce(fn: Callable[[_Return, _T], _Return], coros: Iterable[Coro[_T]], initial: _Return) -> Coro[_Return]:
+    """Runs multiple coroutines, and folds together their outputs as each one finishes.
+
+    This is like `yield [coro1, coro2, ...]`, except that rather than building up a list of every output, each output is
+    passed to `fn` as soon as it is available, and then discarded. Each coroutine is also released as soon as it has
+    finished. This makes it possible to run very many coroutines without holding on to all of their outputs at once:
+    ```python
+    def main():
+        total = yield tinyio.reduce(operator.add, (fetch_size(url) for url in urls), 0)
+    ```
+    For this to help, make sure not to hold onto the coroutines elsewhere, e.g. by passing a generator expression
+    rather than a list. To also limit how many are running at once, see `tinyio.Loop(max_active=...)`.
+
+    **Arguments:**
+
+    - `fn`: called as `fn(accumulated, output)` with each output, and returning the new accumulated value. Note that
+        this is called in the order that the coroutines finish, not the order they were passed in.
+    - `coros`: an iterable of coroutines. It is iterated over immediately.
+    - `initial`: the initial accumulated value.
+
+    **Returns:**
+
+    A coroutine that can be `yield`ed on, returning the final accumulated value.
+    """
+    # Wrapped in a list, so that the generator doesn't keep a reference to `coros` after it has yielded it.
+    return _reduce([_Reduce(fn, coros, initial)])
+
+
+def _reduce(box: list["_Reduce"]) -> Coro:
+    out = yield box.pop()
+    if type(out) is _Raise:
+        raise out.error
+    return out
+
+
+def isolate(
+    coro: Coro[_Return], /, exception_group: None | bool = None
+) -> Coro[tuple[_Return, Literal[True]] | tuple[BaseException, Literal[False]]]:
+    """Runs a coroutine in an isolated region of the event loop, and if it (or any coroutines it yields) fails, then
+    return the exception that occurred. (Cancelling all coroutines it created... but not cancelling the rest of the
+    coroutines on the event loop.)
+
+    This waits until every coroutine in the region has finished, including any that were scheduled in the background
+    with `yield {...}`. Regions may be nested, and an error in an outer region cancels the inner regions too.
+
+    Note that the coroutines it yields must all be *new* coroutines, and they cannot already have been seen by the event
+    loop. (Otherwise it would be ambiguous whether they are inside the isolated region or not.) If `coro` depends on
+    other coroutines, then `tinyio.copy` can be used to asychronously copy their results over.
+
+    **Arguments:**
+
+    - `coro`: a tinyio coroutine.
+    - `exception_group`: as `tinyio.Loop().run(..., exception_group=...)`.
+
+    **Returns:**
+
+    A 2-tuple:
+
+    - the first element is either the result of `fn(*args)`, or its exception.
+    - the second element is whether `fn(*args)` succeeded (`True`) or raised an exception (`False`).
+
+    !!! Example
+
+        Run a coroutine, and always perform cleanup even if an error was raised:
+        ```python
+        def get_request():
+            conn = make_connection():
+            out, success = yield tinyio.isolate(conn.say_hello())
+            yield conn.say_goodbye()
+            if success:
+                return out
+            else:
+                raise out
+        ```
+
+    !!! Example
+
+        If another coroutine provides an output that must be consumed by the isolated coroutine, then it cannot be
+        yielded by the isolated coroutine.
+
+        ```python
+        # The following code is wrong!
+
+        def main():
+            get_x = return_x()
+            # Schedule `get_x` outside of the isolated region...
+            yield get_x
+            yield tinyio.isolate(use_x(get_x))
+
+        def return_x():
+            yield
+            return 3
+
+        def use_x(get_x):
+            # ...and also schedule `get_x` inside of the isolated region! This is not possible.
+            x = yield get_x
+        ```
+
+        Instead, you need to make a fresh coroutine to use within the isolated region:
+
+        ```python
+        def main():
+            get_x = return_x()
+            yield get_x
+            get_x_copy = yield tinyio.copy(get_x)  # this line is new
+            yield tinyio.isolate(use_x(get_x_copy))
+        ```
+    """
+    return _scope(_Isolate(coro, exception_group))
+
+
+def timeout(coro: Coro[_Return], timeout_in_seconds: int | float) -> Coro[tuple[None | _Return, bool]]:
+    """`tinyio` coroutine for running a coroutine for at most `timeout_in_seconds`.
+
+    If the timeout expires, then `coro` is cancelled by raising `tinyio.TimeoutError` inside it. So is everything that
+    it has gone on to start, including any coroutines scheduled in the background with `yield {...}`, any
+    `tinyio.run_in_thread` calls (which have a `tinyio.CancelledError` raised in their thread), and any nested
+    `tinyio.timeout`s. (The exception is any coroutine that is also being waited on from outside the timeout, which is
+    left to carry on running.) If instead `coro` returns in time, then this returns straight away, and anything it has
+    left running in the background carries on as normal.
+
+    Timeouts may be nested, in which case whichever expires first cancels everything inside it.
+
+    If `coro` has already been seen by the loop (e.g. it is already running in the background, or has finished), then
+    it may be shared with other coroutines, so it is not cancelled: this just stops waiting on it once the timeout
+    expires.
+
+    **Arguments:**
+
+    - `coro`: another coroutine.
+    - `timeout_in_seconds`: the maximum number of seconds to allow `coro` to run for.
+
+    **Returns:**
+
+    A coroutine that an be `yield`ed on. This will return a pair of either `(output, True)` or `(None, False)`,
+    corresponding to whether `coro` completed within the timeout or not.
+
+    This also sets the deadline of `coro`, as per `tinyio.deadline`.
+    """
+    if not isinstance(coro, Generator):
+        raise ValueError(f"Invalid input {coro}, which is not a coroutine (a function using `yield` statements).")
+    return _timeout(coro, timeout_in_seconds)
+
+
+def _timeout(coro: Coro[_Return], timeout_in_seconds: int | float) -> Coro[tuple[None | _Return, bool]]:
+    out = yield from _scope(_Timeout(coro, timeout_in_seconds))
+    if out is not None:
+        return out
+    # The loop has already seen `coro`, so just wait on it with a timer.
+    done = Event()
+    outs = []
+    yield {_notify_done(coro, done, outs)}
+    yield done.wait(timeout_in_seconds)
+    if len(outs) == 0:
+        return None, False
+    else:
+        [out] = outs
+        return out, True
+
+
+def _notify_done(coro: Coro, done: "Event", outs: list):
+    outs.append((yield coro))
+    done.set()
+
+
+def _scope(scope: "_Isolate | _Timeout") -> Coro:
+    out = yield scope
+    if type(out) is _Raise:
+        raise out.error
+    return out
+
+
+def checkpoint() -> Coro[None]:
+    """Gives other coroutines a chance to run, but only if the current coroutine has used up its time slice.
+
+    This is intended for CPU-heavy coroutines, which can call it as often as they like, at very little cost:
+    ```python
+    def crunch(items):
+        for item in items:
+            process(item)
+            yield from tinyio.checkpoint()
+    ```
+    Note that this must be used via `yield from`, not just `yield`.
+
+    A coroutine's time slice starts each time it is resumed, and its length is set with
+    `tinyio.Loop(time_slice=...)`. If no time slice is set then this always suspends, just like a bare `yield`.
+    """
+    run = getattr(_current, "run", None)
+    if run is None or run.time_slice is None or time.perf_counter() - run.step_start >= run.time_slice:
+        yield
+
+
 #
 # Loop internals, in particular events and waiting
 #
 
 
-@dataclasses.dataclass(frozen=True)
-class _Todo:
+class _LRUWeakKeyDictionary(weakref.WeakKeyDictionary):
+    """A `WeakKeyDictionary` that also holds at most `maxsize` entries, discarding the least-recently-used."""
+
+    def __init__(self, maxsize: int):
+        super().__init__()
+        # The weakref callbacks set up by `WeakKeyDictionary` just `del` from this, so it's fine to swap it out.
+        self.data = co.OrderedDict()
+        self._maxsize = maxsize
+
+    def __getitem__(self, key):
+        ref = weakref.ref(key)
+        value = self.data[ref]
+        self.data.move_to_end(ref)
+        return value
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        while len(self.data) > self._maxsize:
+            self.data.popitem(last=False)
+
+
+# An entry in the ready queue: a coroutine's state, and the value to `.send` into it.
+# This is just a tuple rather than a class, as we create one of these for every single step of the loop.
+_Todo: TypeAlias = tuple["_CoroState", Any]
+# Someone waiting on a coroutine: either `(waiting_for, index)` for the position in their `yield` at which it appears,
+# or `(state, None)` for a coroutine that yielded just it, and should be resumed directly once it finishes.
+_Waiter: TypeAlias = tuple["_WaitingFor | _Reducer", int] | tuple["_CoroState", None]
+
+
+_lanes = ("high", "normal", "low", "idle")
+# A lane that has coroutines ready will run at least one of them in every this-many steps, even if higher lanes are
+# busy. (The idle lane is the exception.)
+_starvation_limit = 100
+
+
+@final
+@dataclasses.dataclass(frozen=True, slots=True)
+class _Schedule:
+    """Yielded by `tinyio.priority` and `tinyio.deadline`, to start `coro` with a particular lane or deadline."""
+
+    coro: Coro
+    lane: None | Lane
+    deadline: None | int | float
+
+
+@dataclasses.dataclass(slots=True)
+class _Reduce:
+    """Yielded by `tinyio.reduce`."""
+
+    fn: Callable[[Any, Any], Any]
+    coros: Iterable[Coro]
+    initial: Any
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class _Isolate:
+    """Yielded by `tinyio.isolate`."""
+
+    coro: Coro
+    exception_group: None | bool
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class _Timeout:
+    """Yielded by `tinyio.timeout`."""
+
     coro: Coro
-    value: Any
+    timeout_in_seconds: int | float
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class _Raise:
+    """Sent into `tinyio.reduce`, `tinyio.isolate` or `tinyio.timeout`, to raise `error` there. (E.g. if `fn` raises
+    an error.)
+    """
+
+    error: BaseException
+
+
+class _DeadlineQueue:
+    """A lane of the ready queue, in `scheduling="deadline"` mode. This has the same interface as the `co.deque` used
+    for each lane in `scheduling="fifo"` mode, but `.pop`s the coroutine with the earliest deadline, breaking ties in
+    first-in-first-out order.
+    """
+
+    __slots__ = ("_heap", "_count")
+
+    def __init__(self):
+        self._heap: list[tuple[float, int, _Todo]] = []
+        # Each of `heapq.heappush` and `next(it.count)` is atomic, so this is safe to call from other threads.
+        self._count = it.count()
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def appendleft(self, todo: _Todo):
+        heapq.heappush(self._heap, (todo[0].deadline, next(self._count), todo))
+
+    def pop(self) -> _Todo:
+        return heapq.heappop(self._heap)[2]
+
+
+class _ReadyQueue:
+    """The coroutines that are ready to run, split into one FIFO deque per lane.
+
+    Each `_CoroState` holds a reference to the deque for its own lane, and reschedules itself with a plain
+    `.appendleft` onto it. This object is just responsible for deciding which lane to `.pop` from next.
+    """
+
+    __slots__ = ("high", "normal", "low", "idle", "_passed_over")
+
+    def __init__(self, scheduling: Scheduling):
+        lane = co.deque if scheduling == "fifo" else _DeadlineQueue
+        self.high: co.deque[_Todo] | _DeadlineQueue = lane()
+        self.normal: co.deque[_Todo] | _DeadlineQueue = lane()
+        self.low: co.deque[_Todo] | _DeadlineQueue = lane()
+        self.idle: co.deque[_Todo] | _DeadlineQueue = lane()
+        # How many steps in a row each of the normal and low lanes have had something ready, but not been run.
+        self._passed_over = [0, 0]
+
+    def pop(self) -> None | _Todo:
+        """Returns the next coroutine to run, or `None` if there is nothing ready."""
+        high = self.high
+        normal = self.normal
+        low = self.low
+        if not high and not low:
+            # Fast path: no priorities in use. (We don't reset `_passed_over[0]` here, but that only means the normal
+            # lane might get an unnecessary turn earlier the next time it is being passed over.)
+            if normal:
+                return normal.pop()
+            elif self.idle:
+                return self.idle.pop()
+            else:
+                return None
+        lanes = (high, normal, low)
+        for i, lane in enumerate(lanes):
+            if lane:
+                break
+        else:
+            assert False
+        for j in range(i + 1, 3):
+            if lanes[j]:
+                self._passed_over[j - 1] += 1
+                if self._passed_over[j - 1] >= _starvation_limit:
+                    self._passed_over[j - 1] = 0
+                    return lanes[j].pop()
+        if i > 0:
+            self._passed_over[i - 1] = 0
+        return lanes[i].pop()
 
 
 # We need at least some use of locks, as `Event`s are public objects that may interact with user threads. If the
@@ -311,58 +1068,487 @@ class _Todo:
 # go wrong.
 # In particular note that our event loop is one actor that is making modifications, in addition to user threads.
 # For this reason it doesn't suffice to just have a lock around `Event.{set, clear}`.
-# For simplicity, we simply guard all entries into the event/wait/waitingfor mechanism with a single lock. We could try
-# to use some other locking strategy but that seems error-prone.
-_global_event_lock = threading.RLock()
+#
+# We use two kinds of lock, so that independent loops (e.g. one per thread) never contend with each other:
+# - each `Event` has a lock, guarding its flag and its collection of `_Wait`s;
+# - each run of a loop has a lock, guarding the counters of its `_WaitingFor`s and the states of its `_Wait`s.
+# Whenever both are needed then they are acquired in that order: event, then loop. Never the other way around. In
+# particular this means that when a `_WaitingFor` completes, it cannot deregister its `_Wait`s from their events
+# (we may be inside `Event.set` for some other event, holding that event's lock). Instead we mark them as done, and
+# hand them back to the loop to deregister on its next step.
+#
+# A `_WaitingFor` that is only waiting on other coroutines is only ever touched from the loop itself, and so skips the
+# locking altogether.
+
+
+@dataclasses.dataclass(slots=True)
+class _RunState:
+    """Everything a `_WaitingFor` needs to reschedule its coroutine. One of these is shared across a single run of a
+    loop.
+    """
+
+    ready: "_ReadyQueue"
+    waiting_on: dict[Coro, "_CoroState"]
+    wake_loop: EventWithFileno
+    lock: threading.Lock
+    # `_Wait`s that are done, and need deregistering from their events.
+    cleanups: co.deque["_Wait"]
+    timers: "_TimerWheel"
+    time_slice: None | int | float
+    max_active: None | int
+    # When the current step started, as per `time.perf_counter()`. Only tracked if `time_slice` is not `None`.
+    step_start: float = 0.0
+    # Coroutines held back by `max_active`, in the order to start them. This may also contain stale entries for
+    # coroutines that have since been admitted by other means; `num_pending` is the true count.
+    pending: co.deque["_CoroState"] = dataclasses.field(default_factory=co.deque)
+    num_pending: int = 0
+
+
+class Blocked(Protocol):
+    """Yielded by `tinyio.Loop.runtime` when the loop is blocked. See its docstring for how to use this."""
+
+    # Either `None`, or the time (as per `time.monotonic()`) at which the loop should be woken up regardless.
+    @property
+    def deadline(self) -> None | float: ...
+
+    def __call__(self) -> None: ...
+
+    def fileno(self) -> int: ...
+
+    def __enter__(self) -> bool: ...
+
+    def __exit__(self, exc_type, exc_value, exc_tb) -> None: ...
+
+
+Blocked.__module__ = "tinyio"
+
+
+class _Blocked:
+    """The implementation of `tinyio.Blocked`."""
+
+    __slots__ = ("_wake_loop", "deadline")
+
+    def __init__(self, wake_loop: EventWithFileno, deadline: None | float):
+        self._wake_loop = wake_loop
+        self.deadline = deadline
 
+    def __call__(self):
+        self._wake_loop.wait(timeout=None if self.deadline is None else self.deadline - time.monotonic())
 
-@dataclasses.dataclass(frozen=False)
+    def fileno(self) -> int:
+        return self._wake_loop.fileno()
+
+    def __enter__(self) -> bool:
+        return self._wake_loop.arm()
+
+    def __exit__(self, exc_type, exc_value, exc_tb):
+        self._wake_loop.disarm()
+
+
+# The `_RunState` of the loop currently stepping coroutines in this thread, if any. Used by `tinyio.checkpoint()`.
+_current = threading.local()
+
+
+@dataclasses.dataclass(slots=True)
+class _CoroState:
+    """The loop's record of a coroutine that is live in it: either queued to start, or started and not yet finished."""
+
+    coro: Coro
+    # The lane of the ready queue that this coroutine is scheduled into.
+    ready: "co.deque[_Todo] | _DeadlineQueue"
+    # As per `time.monotonic()`. Infinite if there is no deadline.
+    deadline: float
+
+    # Everyone waiting on this coroutine.
+    waiters: list[_Waiter]
+    # The innermost `tinyio.isolate` region that this coroutine is running in, if any.
+    scope: "None | _Scope"
+    # Total seconds spent running this coroutine. Only tracked if the loop has a `time_slice`.
+    time_used: float = 0.0
+    # Whether this coroutine has been put on the ready queue to start, or is still held back by `max_active`.
+    admitted: bool = True
+    # Set once the coroutine has finished.
+    result: Any = None
+    # Whatever is waiting on `Event`s or sleeping on behalf of this coroutine, if anything. Used to deregister those
+    # waits if this coroutine is cancelled by `tinyio.isolate`/`tinyio.timeout`.
+    waiting_for: "None | _WaitingFor | _Sleep" = None
+
+
+@dataclasses.dataclass(slots=True)
+class _Reducer:
+    """Plays the part of a `_WaitingFor`, for `tinyio.reduce`. This folds in each result as it arrives, rather than
+    storing them. It is only ever touched from the loop itself, so needs no locking.
+    """
+
+    counter: int
+    state: _CoroState
+    fn: Callable[[Any, Any], Any]
+    accumulated: Any
+    # Set if `fn` raised an error, in which case we've already rescheduled our coroutine.
+    failed: bool = False
+
+    def deliver(self, index: int, result: Any):
+        del index
+        if self.failed:
+            return
+        try:
+            self.accumulated = self.fn(self.accumulated, result)
+        except BaseException as e:
+            # Raise this in the `tinyio.reduce` coroutine, which then crashes the loop in the usual way.
+            self.failed = True
+            self.state.ready.appendleft((self.state, _Raise(e)))
+        else:
+            self.decrement()
+
+    def decrement(self):
+        if self.failed:
+            return
+        assert self.counter > 0
+        self.counter -= 1
+        if self.counter == 0:
+            self.state.ready.appendleft((self.state, self.accumulated))
+            self.accumulated = None
+
+
+def _start(run: _RunState, waiting_on: dict[Coro, _CoroState], state: _CoroState, force: bool):
+    # Starts a new coroutine (already in `waiting_on`) if there's capacity for it, else holds it back until there is.
+    assert run.max_active is not None
+    if force or len(waiting_on) - run.num_pending <= run.max_active:
+        state.ready.appendleft((state, None))
+    else:
+        state.admitted = False
+        run.pending.appendleft(state)
+        run.num_pending += 1
+
+
+def _admit(run: _RunState, state: _CoroState):
+    # Starts a coroutine that was held back, regardless of capacity.
+    state.admitted = True
+    state.ready.appendleft((state, None))
+    run.num_pending -= 1
+    if run.num_pending == 0:
+        run.pending.clear()
+
+
+def _start_pending(run: _RunState, waiting_on: dict[Coro, _CoroState]):
+    # Called when a coroutine finishes, to start as many held-back coroutines as there is now capacity for. We always
+    # start at least one, even when over capacity (e.g. due to a lot of nested waits). Otherwise, if the coroutine that
+    # just finished was the only one that could run, then everything else might now be waiting on held-back coroutines.
+    assert run.max_active is not None
+    while True:
+        state = run.pending.pop()
+        if not state.admitted:
+            _admit(run, state)
+            if run.num_pending == 0 or len(waiting_on) - run.num_pending >= run.max_active:
+                break
+
+
+@dataclasses.dataclass(eq=False, slots=True)
+class _Scope:
+    """A region of the loop, made up of a coroutine and everything it goes on to start, which can be cancelled as a
+    whole. This is either:
+
+    - a `tinyio.isolate` region, which is a failure domain: an error in any of its coroutines cancels just this region
+        (and any regions nested within it), rather than the whole loop;
+    - a `tinyio.timeout` region, which is cancelled if it expires. If instead its root coroutine returns, then
+        anything left in it is handed over to the enclosing region. Errors propagate onwards, to the nearest enclosing
+        `tinyio.isolate` region or else to the whole loop.
+    """
+
+    # The coroutine that called `tinyio.isolate`/`tinyio.timeout`, which is resumed once this region has finished.
+    parent: _CoroState
+    run: _RunState
+    isolating: bool
+    exception_group: None | bool
+    # The coroutine passed to `tinyio.isolate`/`tinyio.timeout`.
+    root: None | _CoroState = None
+    # For a `tinyio.timeout` region, when it expires (as per `time.monotonic()`), in which case it is in `run.timers`.
+    timeout_in_seconds: None | float = None
+    # Set once this region has finished or been cancelled.
+    finished: bool = False
+    # Every coroutine in this region that hasn't finished yet, excluding those in nested regions.
+    members: dict[Coro, _CoroState] = dataclasses.field(default_factory=dict)
+    # Nested regions that haven't finished yet.
+    children: dict["_Scope", None] = dataclasses.field(default_factory=dict)
+
+    def notify_from_timeout(self):
+        if not self.finished:
+            # (Else we were in the same batch of expired timers as an enclosing region, which has already cancelled us.)
+            _close_scope(self, TimeoutError, (None, False))
+
+
+def _cancelled_coro():
+    yield
+
+
+# Swapped in as the `.coro` of each `_CoroState` cancelled by `tinyio.isolate` or `tinyio.timeout`. This is already
+# closed, so any stale entries for that state in the ready queue, or any late notifications from its events, just finish
+# immediately.
+_cancelled = _cancelled_coro()
+_cancelled.close()
+
+
+def _new_scope(
+    scope: _Scope, coro: Coro, queue: "co.deque[_Todo] | _DeadlineQueue", deadline: float, waiting_on: dict
+) -> _CoroState:
+    parent_scope = scope.parent.scope
+    if parent_scope is not None:
+        parent_scope.children[scope] = None
+    # The root of the region has no waiters (so it is the root of its own tracebacks in `_cleanup`); instead our parent
+    # is resumed once the whole region has finished.
+    state = waiting_on[coro] = _CoroState(coro, queue, deadline, [], scope)
+    scope.root = state
+    scope.members[coro] = state
+    return state
+
+
+def _isolation(scope: None | _Scope) -> None | _Scope:
+    # The innermost `tinyio.isolate` region enclosing `scope` (inclusive), if any.
+    while scope is not None and not scope.isolating:
+        scope = scope.parent.scope
+    return scope
+
+
+def _can_wait(waiter: None | _Scope, waitee: None | _Scope) -> bool:
+    # Whether a coroutine in region `waiter` may wait on a coroutine in region `waitee`. Nothing may cross a
+    # `tinyio.isolate` boundary, as per its documentation. A `tinyio.timeout` region is no boundary at all: if it
+    # expires, then it leaves alone anything that is being waited on from outside it. (See `_spare_shared`.)
+    return _isolation(waiter) is _isolation(waitee)
+
+
+def _finish_scope(scope: _Scope, value: Any):
+    scope.finished = True
+    if scope.timeout_in_seconds is not None:
+        scope.run.timers.remove(scope)
+    parent = scope.parent
+    if parent.scope is not None:
+        del parent.scope.children[scope]
+    parent.ready.appendleft((parent, value))
+
+
+def _release_scope(scope: _Scope):
+    # Hands everything still running in a region over to the enclosing region (if any), to carry on there.
+    enclosing = scope.parent.scope
+    for state in scope.members.values():
+        state.scope = enclosing
+    if enclosing is not None:
+        enclosing.members.update(scope.members)
+        # Each of these was started by one of our members, which has just moved over too.
+        enclosing.children.update(scope.children)
+    scope.members.clear()
+    scope.children.clear()
+
+
+def _fail_scope(
+    base_e: BaseException, scope: _Scope, current_coro: Coro, run: _RunState, waiting_on: dict[Coro, _CoroState]
+):
+    __tracebackhide__ = True
+    # Just as `_cleanup` for the whole loop, except that afterwards we carry on. Nested regions go first, so that by the
+    # time each coroutine that is waiting on one of them is cancelled, it is already gone.
+    for child in list(scope.children):
+        _discard_scope(child, run, waiting_on, CancelledError)
+    try:
+        _cleanup(base_e, scope.members, current_coro, scope.exception_group)
+    except BaseExceptionGroup as e:
+        base_e = e
+    _remove_scope(scope, run, waiting_on)
+    # Return all `Exception`s except `AssertionError` (which usually indicates that some invariant has been broken),
+    # and let everything else (e.g. `KeyboardInterrupt`) propagate.
+    if isinstance(base_e, Exception) and not isinstance(base_e, AssertionError):
+        _finish_scope(scope, (base_e, False))
+    else:
+        _finish_scope(scope, _Raise(base_e))
+    if run.num_pending > 0:
+        _start_pending(run, waiting_on)
+
+
+def _close_scope(scope: _Scope, error_type: type[BaseException], value: Any):
+    # Called when a `tinyio.timeout` region expires, with `error_type=TimeoutError`. Cancel everything left in it, and
+    # then resume our parent with `value`.
+    run = scope.run
+    _spare_shared(scope, run.waiting_on)
+    error = None
+    for child in list(scope.children):
+        error = _prefer_unexpected(error, _discard_scope(child, run, run.waiting_on, error_type), error_type)
+    for coro in scope.members.keys():
+        error = _prefer_unexpected(error, _cancel(coro, None, error_type), error_type)
+    _remove_scope(scope, run, run.waiting_on)
+    if error is None or isinstance(error, error_type):
+        _finish_scope(scope, value)
+    else:
+        # Something responded to being cancelled by raising a different error. Propagate that as usual.
+        _finish_scope(scope, _Raise(error))
+    if run.num_pending > 0:
+        _start_pending(run, run.waiting_on)
+
+
+def _spare_shared(scope: _Scope, waiting_on: dict[Coro, _CoroState]):
+    # Called when a `tinyio.timeout` region is about to be cancelled. Any coroutine in it (or in a region nested within
+    # it) that is being waited on from outside it isn't ours to cancel, and nor is anything that it is waiting on in
+    # turn. Hand all of these over to the enclosing region instead, to carry on running there.
+    subtree = [scope]
+    for region in subtree:
+        subtree.extend(region.children)
+    closing = set(subtree)
+    kept = set[Coro]()
+    kept_regions = set[_Scope]()
+    changed = True
+    while changed:
+        changed = False
+        for region in subtree:
+            if region is not scope and region not in kept_regions and region.parent.coro in kept:
+                # Whoever is waiting on this nested region is being kept, so the whole region is too.
+                kept_regions.add(region)
+                changed = True
+            for coro, state in region.members.items():
+                if coro in kept:
+                    continue
+                if region not in kept_regions:
+                    for waiter in state.waiters:
+                        owner = waiter[0] if waiter[1] is None else waiter[0].state
+                        # (Skipping over stale waiters, that have since finished or been cancelled.)
+                        if owner.coro in waiting_on and (owner.scope not in closing or owner.coro in kept):
+                            break
+                    else:
+                        continue
+                kept.add(coro)
+                changed = True
+    if len(kept) == 0:
+        return
+    enclosing = scope.parent.scope
+    for region in subtree:
+        if region in kept_regions:
+            # Moves along with the coroutine waiting on it.
+            continue
+        for child in list(region.children):
+            if child in kept_regions:
+                del region.children[child]
+                if enclosing is not None:
+                    enclosing.children[child] = None
+        for coro in [coro for coro in region.members if coro in kept]:
+            state = region.members.pop(coro)
+            state.scope = enclosing
+            if enclosing is not None:
+                enclosing.members[coro] = state
+
+
+def _discard_scope(
+    scope: _Scope, run: _RunState, waiting_on: dict[Coro, _CoroState], error: type[BaseException]
+) -> None | BaseException:
+    # Cancels a nested region because its enclosing region has failed or expired, by raising `error` in every
+    # coroutine. Returns some exception raised in response, preferring anything other than `error` itself.
+    out = None
+    for child in list(scope.children):
+        out = _prefer_unexpected(out, _discard_scope(child, run, waiting_on, error), error)
+    for coro in scope.members.keys():
+        out = _prefer_unexpected(out, _cancel(coro, None, error), error)
+    _remove_scope(scope, run, waiting_on)
+    scope.finished = True
+    if scope.timeout_in_seconds is not None:
+        run.timers.remove(scope)
+    del scope.parent.scope.children[scope]  # pyright: ignore[reportOptionalMemberAccess]
+    return out
+
+
+def _prefer_unexpected(
+    e1: None | BaseException, e2: None | BaseException, expected: type[BaseException]
+) -> None | BaseException:
+    if e1 is None or (isinstance(e1, expected) and e2 is not None):
+        return e2
+    else:
+        return e1
+
+
+def _remove_scope(scope: _Scope, run: _RunState, waiting_on: dict[Coro, _CoroState]):
+    # Removes every trace of an (already-cancelled) region from the loop.
+    for coro, state in scope.members.items():
+        del waiting_on[coro]
+        state.coro = _cancelled
+        if not state.admitted:
+            # Leave it for `_start_pending` to skip over.
+            state.admitted = True
+            run.num_pending -= 1
+        waiting_for = state.waiting_for
+        if type(waiting_for) is _Sleep:
+            run.timers.remove(waiting_for)
+            waiting_for.state = None
+        elif waiting_for is not None:
+            waits = waiting_for.out if type(waiting_for.out) is list else [waiting_for.out]
+            for wait in waits:
+                if isinstance(wait, _Wait):
+                    wait.cancel()
+    scope.members.clear()
+    if run.num_pending == 0:
+        run.pending.clear()
+
+
+@dataclasses.dataclass(slots=True)
 class _WaitingFor:
     counter: int
-    coro: Coro
+    state: _CoroState
     out: "None | _Wait | Coro | list[_Wait | Coro]"
-    wake_loop: EventWithFileno
-    results: weakref.WeakKeyDictionary[Coro, Any]
-    queue: co.deque[_Todo]
+    run: _RunState
+    # Set (to `run.lock`) when a `_Wait` is registered against us, after which we may be modified from other threads.
+    lock: "None | threading.Lock" = None
+    # The results of the coroutines we're waiting on, filled in as each one finishes. Entries for `_Wait`s stay `None`.
+    # Only created once needed, as many `_WaitingFor`s are only waiting on `_Wait`s.
+    results: None | list[Any] = None
 
     def __post_init__(self):
         assert self.counter > 0
 
+    def deliver(self, index: int, result: Any):
+        # Called by the loop when the coroutine at position `index` of `self.out` finishes.
+        if self.results is None:
+            self.results = [None] * (len(self.out) if type(self.out) is list else 1)
+        self.results[index] = result
+        self.decrement()
+
     def increment(self):
-        with _global_event_lock:
-            # This assert is valid as our only caller is `_Wait.unnotify_from_event`, which will only have a reference
-            # to us if we haven't completed yet -- otherwise we'd have already called its `_Wait.cleanup` method.
-            assert self.counter != 0
-            self.counter += 1
+        # Our only caller is `_Wait.unnotify_from_event`, which already holds `self.lock`.
+        # This assert is valid as it will only call us if we haven't completed yet -- otherwise we'd have already marked
+        # it as done.
+        assert self.counter != 0
+        self.counter += 1
 
     def decrement(self):
-        # We need a lock here as this may be called simultaneously between our event loop and via `Event.set`.
-        # (Though `Event.set` has its own internal lock, that doesn't cover the event loop as well.)
-        with _global_event_lock:
-            assert self.counter > 0
-            self.counter -= 1
-            if self.counter == 0:
-                match self.out:
-                    case None:
-                        result = None
-                        waits = []
-                    case _Wait():
-                        result = None
-                        waits = [self.out]
-                    case Generator():
-                        result = self.results[self.out]
-                        waits = []
-                    case list():
-                        result = [None if isinstance(out_i, _Wait) else self.results[out_i] for out_i in self.out]
-                        waits = [out_i for out_i in self.out if isinstance(out_i, _Wait)]
-                    case _:
-                        assert False
-                for wait in waits:
-                    wait.cleanup()
-                self.queue.appendleft(_Todo(self.coro, result))
-                # If we're callling this function from a thread, and the main event loop is blocked, then use this to
-                # notify the main event loop that it can wake up.
-                self.wake_loop.set()
+        # Called by the loop when one of the coroutines we're waiting on finishes.
+        lock = self.lock
+        if lock is None:
+            # Fast path: nothing in any other thread can see us.
+            self.decrement_locked()
+        else:
+            with lock:
+                self.decrement_locked()
+
+    def decrement_locked(self):
+        # Either we hold `self.lock`, or we are in the loop and `self.lock is None`.
+        assert self.counter > 0
+        self.counter -= 1
+        if self.counter == 0:
+            match self.out:
+                case None:
+                    result = None
+                    waits = []
+                case _Wait():
+                    result = None
+                    waits = [self.out]
+                case Generator():
+                    assert self.results is not None
+                    [result] = self.results
+                    waits = []
+                case list():
+                    result = self.results
+                    waits = [out_i for out_i in self.out if isinstance(out_i, _Wait)]
+                case _:
+                    assert False
+            for wait in waits:
+                wait.finish()
+            self.state.waiting_for = None
+            self.state.ready.appendleft((self.state, result))
+            # If we're callling this function from a thread, and the main event loop is blocked, then use this to
+            # notify the main event loop that it can wake up.
+            self.run.wake_loop.set()
 
 
 class _WaitState(enum.Enum):
@@ -374,20 +1560,26 @@ class _WaitState(enum.Enum):
 
 
 class _Wait:
+    __slots__ = ("_event", "_timeout_in_seconds", "_waiting_for", "_lock", "state", "timeout_in_seconds")
+
     def __init__(self, event: "Event", timeout_in_seconds: None | int | float):
         self._event = event
         self._timeout_in_seconds = timeout_in_seconds
         self._waiting_for = None
+        self._lock = None
         self.state = _WaitState.INITIALISED
 
     # This is basically just a second `__init__` method. We're not really initialised until this has been called
     # precisely once as well. The reason we have two is that an end-user creates us during `Event.wait()`, and then we
     # need to register on the event loop.
     def register(self, waiting_for: _WaitingFor) -> None:
-        with _global_event_lock:
-            assert self.state is _WaitState.INITIALISED
-            assert self._waiting_for is None
-            assert self._event is not None
+        assert self.state is _WaitState.INITIALISED
+        assert self._waiting_for is None
+        assert self._event is not None
+        # Nothing else can see `waiting_for` until we add ourselves to `self._event._waits` below, so this is safe.
+        waiting_for.lock = waiting_for.run.lock
+        self._lock = waiting_for.run.lock
+        with self._event._lock:
             self.state = _WaitState.REGISTERED
             if self._timeout_in_seconds is None:
                 self.timeout_in_seconds = None
@@ -395,52 +1587,217 @@ class _Wait:
                 self.timeout_in_seconds = time.monotonic() + self._timeout_in_seconds
             self._waiting_for = waiting_for
             self._event._waits[self] = None
-            if self._event.is_set():
+            if self._event._value:
                 self.notify_from_event()
 
     def notify_from_event(self):
-        with _global_event_lock:
+        # Called with `self._event._lock` held.
+        assert self._lock is not None
+        with self._lock:
             # We cannot have `NOTIFIED_EVENT` as our event will have toggled its internal state to `True` as part of
             # calling us, and so future `Event.set()` calls will not call `.notify_from_event`.
-            # We cannot have `DONE` as this is only set during `.cleanup()`, and at that point we deregister from
-            # `self._event._waits`.
-            assert self.state in {_WaitState.REGISTERED, _WaitState.NOTIFIED_TIMEOUT}
-            assert self._waiting_for is not None
+            # We can have `DONE` if we've completed but the loop hasn't deregistered us from our event yet.
+            assert self.state in (_WaitState.REGISTERED, _WaitState.NOTIFIED_TIMEOUT, _WaitState.DONE)
             if self.state == _WaitState.REGISTERED:
+                assert self._waiting_for is not None
                 self.state = _WaitState.NOTIFIED_EVENT
-                self._waiting_for.decrement()
+                self._waiting_for.decrement_locked()
 
     def notify_from_timeout(self):
-        with _global_event_lock:
-            assert self.state in {_WaitState.REGISTERED, _WaitState.NOTIFIED_EVENT}
-            assert self._waiting_for is not None
-            is_registered = self.state == _WaitState.REGISTERED
-            self.state = _WaitState.NOTIFIED_TIMEOUT  # Override `NOTIFIED_EVENT` in case we `unnotify_from_event` later
-            if is_registered:
-                self._waiting_for.decrement()
+        assert self._lock is not None
+        with self._lock:
+            # We can have `DONE` if we've just been completed from another thread.
+            if self.state is not _WaitState.DONE:
+                assert self.state in (_WaitState.REGISTERED, _WaitState.NOTIFIED_EVENT)
+                assert self._waiting_for is not None
+                is_registered = self.state == _WaitState.REGISTERED
+                # Override `NOTIFIED_EVENT` in case we `unnotify_from_event` later
+                self.state = _WaitState.NOTIFIED_TIMEOUT
+                if is_registered:
+                    self._waiting_for.decrement_locked()
 
     def unnotify_from_event(self):
-        with _global_event_lock:
-            assert self.state in {_WaitState.NOTIFIED_EVENT, _WaitState.NOTIFIED_TIMEOUT}
-            assert self._waiting_for is not None
-            # But ignore un-notifies if we've already triggered our timeout.
+        # Called with `self._event._lock` held.
+        assert self._lock is not None
+        with self._lock:
+            assert self.state in (_WaitState.NOTIFIED_EVENT, _WaitState.NOTIFIED_TIMEOUT, _WaitState.DONE)
+            # But ignore un-notifies if we've already triggered our timeout, or completed.
             if self.state is _WaitState.NOTIFIED_EVENT:
+                assert self._waiting_for is not None
                 self.state = _WaitState.REGISTERED
                 self._waiting_for.increment()
 
+    def finish(self):
+        # Called with `self._lock` held, when our `_WaitingFor` completes.
+        assert self.state in (_WaitState.NOTIFIED_EVENT, _WaitState.NOTIFIED_TIMEOUT)
+        assert self._waiting_for is not None
+        self.state = _WaitState.DONE
+        self._waiting_for.run.cleanups.append(self)
+        self._waiting_for = None  # For GC purposes.
+
+    def cancel(self):
+        # Called by the loop, without holding any locks, when our coroutine has been cancelled by `tinyio.isolate`. Like
+        # `.finish()`, except that we may not have been notified yet.
+        event = self._event
+        if event is None:
+            # Already cleaned up.
+            return
+        with event._lock:
+            assert self._lock is not None
+            with self._lock:
+                if self.state is not _WaitState.DONE:
+                    assert self._waiting_for is not None
+                    self.state = _WaitState.DONE
+                    self._waiting_for.run.cleanups.append(self)
+                    self._waiting_for = None
+
     def cleanup(self):
-        with _global_event_lock:
-            assert self.state in {_WaitState.NOTIFIED_EVENT, _WaitState.NOTIFIED_TIMEOUT}
-            assert self._waiting_for is not None
-            assert self._event is not None
-            self.state = _WaitState.DONE
-            self._waiting_for = None  # For GC purposes.
+        # Called by the loop, without holding any locks, some time after `.finish()`.
+        assert self.state is _WaitState.DONE
+        assert self._event is not None
+        with self._event._lock:
             del self._event._waits[self]
-            self._event = None  # For GC purposes.
+        self._event = None  # For GC purposes.
+
 
-    # For `heapq` to work.
-    def __lt__(self, other):
-        return self.timeout_in_seconds < other.timeout_in_seconds
+@final
+class _Sleep:
+    """Yielded by `tinyio.sleep`/`tinyio.sleep_until`. The loop puts this straight into its timers, and resumes the
+    sleeping coroutine once it fires.
+    """
+
+    __slots__ = ("timeout_in_seconds", "state")
+
+    def __init__(self, timeout_in_seconds: float):
+        # As per `time.monotonic()`.
+        self.timeout_in_seconds = timeout_in_seconds
+        self.state: None | _CoroState = None
+
+    def notify_from_timeout(self):
+        state = self.state
+        if state is None:
+            # We were in the same batch of expired timers as an enclosing `tinyio.timeout`, which has already cancelled
+            # our coroutine.
+            return
+        self.state = None
+        state.waiting_for = None
+        state.ready.appendleft((state, None))
+
+
+class _Timer(Protocol):
+    """Anything that can go in a `_TimerWheel`: a `_Wait` with a timeout, a `_Sleep`, or a `tinyio.timeout` region."""
+
+    # As per `time.monotonic()`. Never `None` whilst in a `_TimerWheel`.
+    @property
+    def timeout_in_seconds(self) -> None | float: ...
+
+    def notify_from_timeout(self) -> None: ...
+
+
+class _TimerWheel:
+    """The timeouts of all `_Timer`s in a loop.
+
+    This is a hashed timer wheel: `_Timer`s are put into buckets according to which `resolution`-sized tick their
+    timeout falls in. Adding and removing a `_Timer` is then O(1), and in particular `_Timer`s are genuinely removed as
+    soon as they are done. (It is very common for a timeout to never actually fire, e.g. because the event it is
+    guarding was set first.)
+
+    To find the next timeout, we keep a heap of the ticks that have buckets. This is O(log number-of-distinct-ticks)
+    rather than O(log number-of-timeouts), and as it is keyed by absolute tick, it handles arbitrarily long timeouts
+    without needing any wrap-around or cascading. Empty buckets are deleted straight away, and their ticks lazily
+    removed from the heap (which we compact if it gets too stale).
+
+    With `slack`, we wake up that much later than the next timeout, so that every timeout within that window is handled
+    in a single wakeup.
+
+    Only ever touched from the loop's own thread, so no locking.
+    """
+
+    def __init__(self, resolution: float = 1e-3, slack: float = 0.0):
+        self._resolution = resolution
+        self._slack = slack
+        # Each bucket maps `_Timer`s to their timeouts. Every bucket has its tick in the heap; the heap may also have
+        # ticks without buckets (or duplicate ticks), which are skipped over.
+        self._buckets = dict[int, dict[_Timer, float]]()
+        self._ticks: list[int] = []
+        self._len = 0
+
+    def __len__(self) -> int:
+        return self._len
+
+    def add(self, timer: _Timer) -> None:
+        timeout = timer.timeout_in_seconds
+        assert timeout is not None
+        if timeout == math.inf:
+            # Will never fire, so just like having no timeout at all.
+            return
+        tick = int(timeout // self._resolution)
+        try:
+            bucket = self._buckets[tick]
+        except KeyError:
+            bucket = self._buckets[tick] = {}
+            if len(self._ticks) > 2 * len(self._buckets) + 64:
+                # A sorted list is a valid heap.
+                self._ticks = sorted(self._buckets.keys())
+            else:
+                heapq.heappush(self._ticks, tick)
+        bucket[timer] = timeout
+        self._len += 1
+
+    def remove(self, timer: _Timer) -> None:
+        timeout = timer.timeout_in_seconds
+        assert timeout is not None
+        if timeout == math.inf:
+            return
+        tick = int(timeout // self._resolution)
+        bucket = self._buckets.get(tick)
+        if bucket is not None and timer in bucket:
+            del bucket[timer]
+            self._len -= 1
+            if len(bucket) == 0:
+                del self._buckets[tick]
+
+    def _soonest_bucket(self) -> "None | tuple[int, dict[_Timer, float]]":
+        while len(self._ticks) > 0:
+            tick = self._ticks[0]
+            bucket = self._buckets.get(tick)
+            if bucket is None:
+                heapq.heappop(self._ticks)
+            else:
+                return tick, bucket
+        return None
+
+    def pop_expired(self, now: float) -> list[_Timer]:
+        out = []
+        while (soonest := self._soonest_bucket()) is not None:
+            tick, bucket = soonest
+            if tick * self._resolution > now:
+                break
+            for timer, timeout in list(bucket.items()):
+                if timeout <= now:
+                    del bucket[timer]
+                    out.append(timer)
+            if len(bucket) == 0:
+                heapq.heappop(self._ticks)
+                del self._buckets[tick]
+            else:
+                # The remaining timeouts in this bucket are less than one tick away.
+                break
+        self._len -= len(out)
+        return out
+
+    def next_timeout(self, now: float) -> None | float:
+        """The number of seconds until the next timeout, or `None` if there are no timeouts."""
+        soonest = self._soonest_bucket()
+        if soonest is None:
+            return None
+        tick, bucket = soonest
+        start = tick * self._resolution + self._slack
+        if start > now:
+            # Wake up at the start of the bucket, which is at most `resolution` early.
+            return start - now
+        else:
+            return min(bucket.values()) + self._slack - now
 
 
 class Event:
@@ -449,19 +1806,20 @@ class Event:
     def __init__(self):
         self._value = False
         self._waits = dict[_Wait, None]()
+        self._lock = threading.Lock()
 
     def is_set(self):
         return self._value
 
     def set(self):
-        with _global_event_lock:
+        with self._lock:
             if not self._value:
                 for wait in self._waits.copy().keys():
                     wait.notify_from_event()
                 self._value = True
 
     def clear(self):
-        with _global_event_lock:
+        with self._lock:
             if self._value:
                 for wait in self._waits.keys():
                     wait.unnotify_from_event()
@@ -479,11 +1837,13 @@ class Event:
 #
 
 
-def _cancel(coro: Coro, msg: None | str) -> None | CancelledError | BaseException:
+def _cancel(
+    coro: Coro, msg: None | str, error_type: type[BaseException] = CancelledError
+) -> None | CancelledError | BaseException:
     __tracebackhide__ = True  # `coro.throw` adds this frame
     try:
-        out = coro.throw(CancelledError if msg is None else CancelledError(msg))
-    except CancelledError as e:
+        out = coro.throw(error_type if msg is None else error_type(msg))
+    except error_type as e:
         return e
     except StopIteration as e:
         what_did = f"returned `{e.value}`."
@@ -499,8 +1859,8 @@ def _cancel(coro: Coro, msg: None | str) -> None | CancelledError | BaseExceptio
         error = None
     warnings.warn(
         f"Coroutine `{coro}` did not respond properly to cancellation on receiving a "
-        "`tinyio.CancelledError`, and so a resource leak may have occurred. The coroutine is expected to "
-        "propagate the `tinyio.CancelledError` to indicate success in cleaning up resources. Instead, the "
+        f"`tinyio.{error_type.__name__}`, and so a resource leak may have occurred. The coroutine is expected to "
+        f"propagate the `tinyio.{error_type.__name__}` to indicate success in cleaning up resources. Instead, the "
         f"coroutine {what_did}\n",
         category=RuntimeWarning,
         stacklevel=3,
@@ -530,19 +1890,37 @@ def _invalid(coro: Coro, value: Any) -> NoReturn:
     _throw(coro, msg)
 
 
+def _is_created(coro: Coro) -> bool:
+    # Equivalent to `inspect.getgeneratorstate(coro) == inspect.GEN_CREATED`, but cheaper. We hit this for every new
+    # coroutine, and it lets us skip looking them up in `Loop._results`.
+    coro = cast(types.GeneratorType, coro)
+    return coro.gi_frame is not None and not coro.gi_suspended and not coro.gi_running
+
+
+def _wrong_scope(coro: Coro, value: Coro) -> NoReturn:
+    __tracebackhide__ = True
+    msg = (
+        f"The coroutine `{value}` is running on the other side of a `tinyio.isolate` boundary. Coroutines inside an "
+        "isolated region can only wait on other coroutines inside the same region, and vice versa. (Use `tinyio.copy` "
+        "to pass results across.)"
+    )
+    _throw(coro, msg)
+
+
 def _check_not_started(coro: Coro, value: Coro) -> None | NoReturn:
     __tracebackhide__ = True
     if inspect.getgeneratorstate(value) != inspect.GEN_CREATED:
         msg = (
             f"The coroutine `{value}` has already started. However it has not been seen by the `tinyio` loop before "
-            "and as such does not have any result associated with it."
+            "(or its result has since been discarded, as per `tinyio.Loop(max_results=...)`) and as such does not have "
+            "any result associated with it."
         )
         _throw(coro, msg)
 
 
 def _cleanup(
     base_e: BaseException,
-    waiting_on: dict[Coro, list[_WaitingFor]],
+    waiting_on: dict[Coro, _CoroState],
     current_coro: Coro,
     exception_group: None | bool,
 ):
@@ -597,12 +1975,13 @@ def _cleanup(
                 tb_ = tb_.tb_next
             for tb_ in reversed(flat_tb):
                 tb = types.TracebackType(tb, tb_.tb_frame, tb_.tb_lasti, tb_.tb_lineno)
-        if len(waiting_on[coro]) != 1:
+        waiters = waiting_on[coro].waiters
+        if len(waiters) != 1:
             # Either no-one is waiting on us and we're at the root, or multiple are waiting and we can't uniquely append
             # tracebacks any more.
             break
-        [waiting_for] = waiting_on[coro]
-        coro = waiting_for.coro
+        [waiter] = waiters
+        coro = (waiter[0] if waiter[1] is None else waiter[0].state).coro
     base_e.with_traceback(tb)  # pyright: ignore[reportPossiblyUnboundVariable]
     filter_traceback(base_e)
     if exception_group is None:
@@ -1,5 +1,7 @@
 import contextlib
+import math
 import queue
+import time
 from collections.abc import Awaitable, Callable, Coroutine
 from typing import Any, TypeVar, cast
 
@@ -10,6 +12,11 @@ from ._thread import run_in_thread
 _Return = TypeVar("_Return")
 
 
+# When running inside another event loop, run batches of up to this many seconds' worth of steps before handing control
+# back to the host loop. This gets most of the throughput of `Loop.run`, whilst still being cooperative.
+_time_slice = 1e-3
+
+
 def from_asyncio(coro: Coroutine[Any, Any, _Return]) -> Coro[_Return]:
     """Converts an `asyncio`-compatible coroutine into a `tinyio`-compatible coroutine."""
 
@@ -41,7 +48,7 @@ async def to_asyncio(coro: Coro[_Return], exception_group: None | bool = None) -
     """Converts a `tinyio`-compatible coroutine into an `asyncio`-compatible coroutine."""
     import asyncio
 
-    with Loop().runtime(coro, exception_group) as gen:
+    with Loop().runtime(coro, exception_group, max_steps=None, max_time=_time_slice) as gen:
         while True:
             try:
                 wait = next(gen)
@@ -50,7 +57,38 @@ async def to_asyncio(coro: Coro[_Return], exception_group: None | bool = None) -
             if wait is None:
                 await asyncio.sleep(0)
             else:
-                await asyncio.get_running_loop().run_in_executor(None, wait)
+                await _asyncio_wait(wait)
+
+
+async def _asyncio_wait(wait):
+    import asyncio
+
+    loop = asyncio.get_running_loop()
+    with wait as woken:
+        if woken:
+            return
+        # Wait for the tinyio loop's wakeup fd in asyncio's own selector, rather than blocking a thread on it.
+        future = loop.create_future()
+
+        def wake():
+            if not future.done():
+                future.set_result(None)
+
+        try:
+            loop.add_reader(wait.fileno(), wake)
+        except NotImplementedError:
+            # E.g. the proactor event loop on Windows, which doesn't support waiting on arbitrary fds.
+            pass
+        else:
+            handle = None if wait.deadline is None else loop.call_later(wait.deadline - time.monotonic(), wake)
+            try:
+                await future
+            finally:
+                loop.remove_reader(wait.fileno())
+                if handle is not None:
+                    handle.cancel()
+            return
+    await loop.run_in_executor(None, wait)
 
 
 def from_trio(coro: Awaitable[_Return]) -> Coro[_Return]:
@@ -119,7 +157,7 @@ async def to_trio(coro: Coro[_Return], exception_group: None | bool = None) -> _
     """Converts a `tinyio`-compatible coroutine into a `trio`-compatible coroutine."""
     import trio  # pyright: ignore[reportMissingImports]
 
-    with Loop().runtime(coro, exception_group) as gen:
+    with Loop().runtime(coro, exception_group, max_steps=None, max_time=_time_slice) as gen:
         while True:
             try:
                 wait = next(gen)
@@ -128,4 +166,13 @@ async def to_trio(coro: Coro[_Return], exception_group: None | bool = None) -> _
             if wait is None:
                 await trio.sleep(0)
             else:
-                await trio.to_thread.run_sync(wait)
+                with wait as woken:
+                    if not woken:
+                        # Wait for the tinyio loop's wakeup fd in trio's own I/O manager, rather than blocking a thread
+                        # on it.
+                        if wait.deadline is None:
+                            deadline = math.inf
+                        else:
+                            deadline = trio.current_time() + wait.deadline - time.monotonic()
+                        with trio.move_on_at(deadline):
+                            await trio.lowlevel.wait_readable(wait.fileno())
@@ -4,6 +4,7 @@ import threading
 from collections.abc import Callable, Iterable
 from typing import ParamSpec, TypeVar, cast
 
+from ._background import gather
 from ._core import CancelledError, Coro, Event
 from ._sync import Semaphore
 
@@ -137,6 +138,7 @@ class ThreadPool:
         - `value`: the maximum number of threads to launch at a time.
         """
 
+        self._max_threads = max_threads
         self._semaphore = Semaphore(max_threads)
 
     def run_in_thread(
@@ -154,5 +156,7 @@ class ThreadPool:
         """Like `[tinyio.run_in_thread(fn, x) for x in xs]`.
 
         Usage is `output_list = pool.map(...)`
+
+        `xs` is only pulled from as threads become available, so it may be a lazy iterator.
         """
-        return (yield [self.run_in_thread(fn, x) for x in xs])
+        return (yield gather((self.run_in_thread(fn, x) for x in xs), limit=self._max_threads))
@@ -1,10 +1,7 @@
-import contextlib
-from typing import TypeVar
+import time
+from collections.abc import Iterator
 
-from ._core import Coro, Event
-
-
-_T = TypeVar("_T")
+from ._core import Coro, _Sleep
 
 
 def sleep(delay_in_seconds: int | float) -> Coro[None]:
@@ -18,43 +15,71 @@ def sleep(delay_in_seconds: int | float) -> Coro[None]:
 
     A coroutine that just sleeps.
     """
-    yield from Event().wait(delay_in_seconds)
+    yield _Sleep(time.monotonic() + delay_in_seconds)
+
+
+def sleep_until(deadline: int | float) -> Coro[None]:
+    """`tinyio` coroutine for sleeping until a particular time, without blocking the event loop.
+
+    **Arguments:**
+
+    - `deadline`: the time to wake up at, as per `time.monotonic()`. If this is already in the past then this just
+        yields control back to the event loop once.
 
+    **Returns:**
 
-class TimeoutError(BaseException):
-    pass
+    A coroutine that just sleeps.
+    """
+    yield _Sleep(deadline)
 
 
-TimeoutError.__module__ = "tinyio"
+def interval(period: int | float) -> Iterator[Coro[int]]:
+    """Iterator-of-coroutines for running something periodically, without drifting.
 
+    This is used as:
+    ```python
+    def heartbeat():
+        for tick in tinyio.interval(period):
+            missed = yield tick
+            send_heartbeat()
+    ```
+    The ticks are at fixed points in time: `period` seconds after this is called, then `2 * period` seconds, and so on.
+    The time spent between ticks (in `send_heartbeat()` above) doesn't push later ticks back.
 
-def timeout(coro: Coro[_T], timeout_in_seconds: int | float) -> Coro[tuple[None | _T, bool]]:
-    """`tinyio` coroutine for running a coroutine for at most `timeout_in_seconds`.
+    If the loop falls so far behind that whole ticks have been missed, then these are skipped rather than all being
+    fired at once: the next `yield tick` returns straight away, with the number of ticks that were skipped.
 
     **Arguments:**
 
-    - `coro`: another coroutine.
-    - `timeout_in_seconds`: the maximum number of seconds to allow `coro` to run for.
+    - `period`: the number of seconds between ticks.
 
     **Returns:**
 
-    A coroutine that an be `yield`ed on. This will return a pair of either `(output, True)` or `(None, False)`,
-    corresponding to whether `coro` completed within the timeout or not.
+    An infinite iterator of coroutines. Each one waits until the next tick, and returns the number of ticks that were
+    missed in the meantime (normally zero). At most one of them can be waited on at a time.
     """
-    done = Event()
-    outs = []
-
-    def wrapper():
-        out = yield coro
-        outs.append(out)
-        done.set()
-
-    yield {wrapper()}
-    yield from done.wait(timeout_in_seconds)
-    if len(outs) == 0:
-        with contextlib.suppress(TimeoutError):
-            coro.throw(TimeoutError)
-        return None, False
-    else:
-        [out] = outs
-        return out, True
+    if period <= 0:
+        raise ValueError("`tinyio.interval` must have a positive `period`.")
+    # All of our ticks share this one timer. Created here rather than in `_interval`, so that the ticks are counted
+    # from now, not from whenever we're first iterated over.
+    return _interval(_Sleep(time.monotonic() + period), period)
+
+
+def _interval(sleep: _Sleep, period: int | float) -> Iterator[Coro[int]]:
+    while True:
+        yield _tick(sleep, period)
+
+
+def _tick(sleep: _Sleep, period: int | float) -> Coro[int]:
+    if sleep.state is not None:
+        raise RuntimeError("Cannot wait on two ticks of the same `tinyio.interval` at the same time.")
+    missed = max(0, int((time.monotonic() - sleep.timeout_in_seconds) // period))
+    sleep.timeout_in_seconds += missed * period
+    try:
+        yield sleep
+    except BaseException:
+        # Cancelled: leave the tick where it is, so that the next one can pick it up.
+        sleep.state = None
+        raise
+    sleep.timeout_in_seconds += period
+    return missed
@@ -1,50 +1,243 @@
 import contextlib
+import math
+import os
 import select
 import socket
 import threading
+import time
 import types
+from typing import Literal
 
 
-# Not sure if this lock is really necessary, but it's easier to reason about this way.
-_global_event_lock = threading.Lock()
+Wakeup = Literal["eventfd", "pipe", "socketpair"]
 
 
-class EventWithFileno:
-    """Like `threading.Event`, but has a fileno and can thus be used across processes."""
+class _EventfdWakeup:
+    # Linux only. A single fd, and reading it resets its counter to zero in one syscall.
+
+    def __init__(self):
+        self._fd = os.eventfd(0, os.EFD_NONBLOCK | os.EFD_CLOEXEC)  # pyright: ignore[reportAttributeAccessIssue]
+
+    def write(self):
+        os.eventfd_write(self._fd, 1)  # pyright: ignore[reportAttributeAccessIssue]
+
+    def drain(self):
+        os.eventfd_read(self._fd)  # pyright: ignore[reportAttributeAccessIssue]
+
+    def close(self):
+        os.close(self._fd)
+        self._fd = -1
+
+    def read_fileno(self):
+        return self._fd
+
+    def write_fileno(self):
+        return self._fd
+
+
+class _PipeWakeup:
+    # POSIX only.
+
+    def __init__(self):
+        self._read_fd, self._write_fd = os.pipe()
+        os.set_blocking(self._read_fd, False)
+        os.set_blocking(self._write_fd, False)
+
+    def write(self):
+        os.write(self._write_fd, b"\x00")
+
+    def drain(self):
+        while len(os.read(self._read_fd, 1024)) > 0:
+            pass
+
+    def close(self):
+        os.close(self._read_fd)
+        os.close(self._write_fd)
+        self._read_fd = self._write_fd = -1
+
+    def read_fileno(self):
+        return self._read_fd
+
+    def write_fileno(self):
+        return self._write_fd
+
+
+class _SocketpairWakeup:
+    # Works with `select` on all platforms, including Windows.
 
     def __init__(self):
-        # socketpair works with select on all platforms (including Windows)
         self._read_sock, self._write_sock = socket.socketpair()
         self._read_sock.setblocking(False)
         self._write_sock.setblocking(False)
 
+    def write(self):
+        self._write_sock.send(b"\x00")
+
+    def drain(self):
+        while len(self._read_sock.recv(1024)) > 0:
+            pass
+
+    def close(self):
+        self._read_sock.close()
+        self._write_sock.close()
+
+    def read_fileno(self):
+        return self._read_sock.fileno()
+
+    def write_fileno(self):
+        return self._write_sock.fileno()
+
+
+_wakeups = {"eventfd": _EventfdWakeup, "pipe": _PipeWakeup, "socketpair": _SocketpairWakeup}
+
+
+def available_wakeups() -> list[Wakeup]:
+    """The wakeup backends supported on this platform, in order of preference."""
+    out: list[Wakeup] = []
+    if hasattr(os, "eventfd"):
+        out.append("eventfd")
+    if os.name == "posix":
+        # On Windows, pipes cannot be used with `select`.
+        out.append("pipe")
+    out.append("socketpair")
+    return out
+
+
+def check_wakeup(wakeup: None | Wakeup) -> Wakeup:
+    available = available_wakeups()
+    if wakeup is None:
+        return available[0]
+    if wakeup not in available:
+        raise ValueError(f"Invalid `wakeup={wakeup!r}`. On this platform the available options are {available}.")
+    return wakeup
+
+
+# For spinning in `EventWithFileno.wait`. Gives up the GIL and our CPU, so that whichever thread is going to `.set()` us
+# can actually do so. (Just `time.sleep(0)` gives up the GIL, but then immediately competes to take it back again.)
+_relax = os.sched_yield if hasattr(os, "sched_yield") else lambda: time.sleep(0)
+
+
+class EventWithFileno:
+    """Like `threading.Event`, but has a fileno and can thus be used across processes."""
+
+    # Most of the time, `.set()` is called from the loop's own thread whilst the loop is busy stepping coroutines, and
+    # then there is no need to touch the fd at all. So we track three flags alongside it:
+    # - `_signalled`: whether `.set()` has been called since the last `.clear()`;
+    # - `_waiting`: whether we are (possibly) inside `.wait()`;
+    # - `_written`: whether there may be bytes in the fd that need draining.
+    # and only write to the fd if someone might be blocked on it.
+    # `.set()` writes `_signalled` then reads `_waiting`, whilst `.wait()` writes `_waiting` then reads `_signalled`,
+    # so (as the GIL makes these sequentially consistent) at least one of them will see the other, and we cannot miss a
+    # wakeup.
+    #
+    # With `max_spin`, `.wait()` first polls `_signalled` for a while before blocking on the fd. How long for is tuned
+    # as we go: `_spin` grows towards twice however long it has recently taken to be woken up, as long as that is within
+    # `max_spin`, and is halved every time that spinning doesn't pay off.
+
+    def __init__(self, wakeup: None | Wakeup = None, max_spin: float = 0.0):
+        self._wakeup = _wakeups[check_wakeup(wakeup)]()
+        self._signalled = False
+        self._waiting = False
+        self._written = False
+        self._max_spin = max_spin
+        self._spin = max_spin
+        # `select.select` cannot handle fds >= `FD_SETSIZE` (typically 1024), which is easy to hit in a process with
+        # many open files or sockets, so prefer `poll` where we have it. (Not on Windows, but there `FD_SETSIZE` limits
+        # the number of fds passed to `select`, not their values.)
+        if hasattr(select, "poll"):
+            self._poll = select.poll()
+            self._poll.register(self._wakeup.read_fileno(), select.POLLIN)
+        else:
+            self._poll = None
+        # Only guards against racing a write with `.close()`, so that we don't write to an fd that has been reused.
+        self._lock = threading.Lock()
+
     def set(self):
-        with _global_event_lock:
-            with contextlib.suppress(OSError):
-                # Can be a `BlockingIOError` if this is already set.
-                # Can be a general `OSError` if the we have already `.close`d.
-                self._write_sock.send(b"\x00")
+        if self._signalled:
+            # Whoever set us before has already done everything that needs doing.
+            return
+        self._signalled = True
+        if self._waiting:
+            with self._lock:
+                with contextlib.suppress(OSError, ValueError):
+                    # Can be a `BlockingIOError` if this is already set.
+                    # Can be a general `OSError` (socket) or `ValueError` (raw fd of -1) if we have already `.close`d.
+                    self._wakeup.write()
+            self._written = True
 
     def clear(self):
-        with _global_event_lock:
-            with contextlib.suppress(OSError):
-                while len(self._read_sock.recv(1024)) > 0:
-                    pass
+        # Only ever called from the loop itself. This is the common case on every step, so keep it syscall-free.
+        self._signalled = False
+        if self._written:
+            self._written = False
+            with contextlib.suppress(OSError, ValueError):
+                self._wakeup.drain()
 
     def wait(self, timeout: None | int | float = None):
-        if timeout is None or timeout > 0:
-            with contextlib.suppress(ValueError):
-                # ValueError if we have already `.close`d, as then the fileno is -1.
-                select.select([self._read_sock], [], [], timeout)
+        if self._max_spin > 0 and not self._signalled:
+            self._spin_wait(timeout)
+        else:
+            self._block(timeout)
+
+    def _spin_wait(self, timeout: None | int | float):
+        start = time.monotonic()
+        # Timeouts shorter than `max_spin` are spun out in full, as blocking can easily overshoot them.
+        short = timeout is not None and timeout <= self._max_spin
+        end = start + (timeout if short else self._spin)  # pyright: ignore[reportOperatorIssue]
+        while not self._signalled and time.monotonic() < end:
+            _relax()
+        if not self._signalled and not short:
+            self._block(None if timeout is None else timeout - (time.monotonic() - start))
+        if self._signalled:
+            waited = time.monotonic() - start
+            if waited <= self._max_spin:
+                self._spin = min(self._max_spin, max(self._spin, 2 * waited))
+            else:
+                self._spin /= 2
+        elif not short:
+            self._spin /= 2
+
+    def _block(self, timeout: None | int | float):
+        self._waiting = True
+        try:
+            if not self._signalled and (timeout is None or timeout > 0):
+                readable = []
+                if self._poll is None:
+                    with contextlib.suppress(ValueError):
+                        # ValueError if we have already `.close`d, as then the fileno is -1.
+                        readable, _, _ = select.select([self._wakeup.read_fileno()], [], [], timeout)
+                else:
+                    # `poll` takes milliseconds. Round up so that we don't wake up just before a timeout is due.
+                    readable = self._poll.poll(None if timeout is None else math.ceil(timeout * 1000))
+                if len(readable) > 0:
+                    # There may be a byte left over from a `.set()` that raced with a previous `.clear()`. Make sure
+                    # the next `.clear()` consumes it, else we would spin.
+                    self._written = True
+        finally:
+            self._waiting = False
         # Don't consume the bytes here - let clear() do that
 
+    def fileno(self):
+        return self._wakeup.read_fileno()
+
+    def arm(self) -> bool:
+        # For when some other event loop is waiting for `.fileno()` to become readable, rather than us being in
+        # `.wait()`. From now until `.disarm()`, any `.set()` will write to the fd. Returns whether we're already set,
+        # in which case there is no need to wait.
+        self._waiting = True
+        return self._signalled
+
+    def disarm(self):
+        self._waiting = False
+        # We don't know whether anything was written whilst we were armed, so make sure the next `.clear()` drains it.
+        self._written = True
+
     def close(self):
-        with _global_event_lock:
-            self._read_sock.close()
-            self._write_sock.close()
+        with self._lock:
+            self._wakeup.close()
 
     def get_write_fd(self):
-        return self._write_sock.fileno()
+        return self._wakeup.write_fileno()
 
 
 class SimpleContextManager: